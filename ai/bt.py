@@ -17,12 +17,12 @@ class Sequence(Node):
         self.i = 0; return SUCCESS
     
 class Selector(Node):
-    def __init__(self, *children): self.child = list(children)
+    def __init__(self, *children): self.children = list(children)
     def tick(self, ctx, dt):
         for c in self.children:
             s = c.tick(ctx, dt)
             if s in (RUNNING, SUCCESS): return s
-            return FAILURE
+        return FAILURE
         
 class Wait(Node):
     def __init__(self, t): self.t = t; self.left = t
@@ -45,12 +45,13 @@ class BossBT:
     """패턴 선택(Selector) -> Telegraph -> Attack -> Cooldown(Sequence)"""
     def __init__(self):
         self.pattern_idx = 0
+        self.ctx = {}   # 틱 사이에 유지 (Wait 중에도 고른 패턴 기억)
         self.patterns = [
             Pattern("fan"), Pattern("circle"), Pattern("homing"), Pattern("laser")
         ]
         #트리 구성
         self.tree = Sequence(
-            Action(self.__choose_pattern),
+            Action(self._choose_pattern),
             Action(self._telegraph),
             Wait(0.35),
             Action(self._attack),
@@ -67,10 +68,9 @@ class BossBT:
             candidates = [1,2]  # circle, homing
         else:
             candidates = [0,1,3]    # fan, circle, laser
-        # round-robin 섞기
-        self.pattern_idx = (self.pattern_idx + 1) % len(self.patterns)
-        if self.pattern_idx not in candidates:
-            self.pattern_idx = candidates[0]
+        # round-robin 섞기: 후보 중 현재 다음 번호, 없으면 처음으로
+        nxt = [c for c in candidates if c > self.pattern_idx]
+        self.pattern_idx = nxt[0] if nxt else candidates[0]
         ctx["pattern"] = self.patterns[self.pattern_idx].name
         return SUCCESS
     
@@ -93,15 +93,15 @@ class BossBT:
             base = math.atan2(py-ey, px-ex)
             for i in range(-3,4):
                 ang = base + i*0.18
-                world.bullets.append(_bullet(ex, ey, math.cos(ang), math.sin(ang), speed=260, ttl=3.0))
+                world.bullets.spawn(ex, ey, math.cos(ang), math.sin(ang), speed=260, ttl=3.0)
         elif name == "circle":
             for i in range(18):
                 ang = i*(math.tau/18)
-                world.bullets.append(_bullet(ex, ey, math.cos(ang), math.sin(ang), speed=260, ttl=3.2))
+                world.bullets.spawn(ex, ey, math.cos(ang), math.sin(ang), speed=260, ttl=3.2)
         elif name == "homing":
             dx, dy = _norm(px-ex, py-ey)
             for _ in range(4):
-                world.bullets.append(_bullet(ex, ey, dx, dy, speed=140, ttl=3.5, radius=5, dmg=2, homing=True))
+                world.bullets.spawn(ex, ey, dx, dy, speed=140, ttl=3.5, radius=5, dmg=2, homing=True)
         elif name == "laser":
             # telegraph 단계에서 이미 레이저 추가됨 (active 단계에서 실제 데미지)
             pass
@@ -109,14 +109,10 @@ class BossBT:
     
     # --- 외부 인터페이스 ---
     def tick(self, boss, world, dt):
-        ctx = {"boss": boss, "world": world}
-        self.tree.tick(ctx, dt)
+        self.ctx["boss"] = boss; self.ctx["world"] = world
+        self.tree.tick(self.ctx, dt)
 
 #helpers       
-def _bullet(x, y, dx, dy, speed=220, ttl=2.5, radius=4, dmg=1, homing=False):
-    from engine.projectiles import Projectiles
-    return Projectiles(x, y, dx, dy, speed=speed, ttl=ttl, radius=radius, dmg=dmg, homing=homing)
-
 def _norm(vx, vy):
     l = math.hypot(vx, vy)
-    return (0.0, 0.0) if l==0 else (vx/1, vy/1)
\ No newline at end of file
+    return (0.0, 0.0) if l==0 else (vx/l, vy/l)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import math
+from collections import deque
+from engine.grid import WALL
+
+# atan2 각도 순서 (y축 아래 방향). 인덱스 = 방위(octant)
+DIRS8 = ((1,0),(1,1),(0,1),(-1,1),(-1,0),(-1,-1),(0,-1),(1,-1))
+
+def _unit(vx, vy):
+    l = math.hypot(vx, vy)
+    return (0.0, 0.0) if l == 0 else (vx/l, vy/l)
+
+def octant(vx, vy):
+    """방향 벡터 -> DIRS8 인덱스"""
+    return int(round(math.atan2(vy, vx) / (math.pi/4))) % 8
+
+class CoverField:
+    """
+    레벨 로드 때 한 번 만드는 엄폐 표 (벽은 바뀌지 않으므로 재계산 없음)
+    - 가장 가까운 벽: 벽 타일 전체에서 출발하는 다중 출발 BFS 거리 변환
+    - 엄폐 지점: 방위 o 쪽 이웃이 벽인 바닥 타일 = o 방향에서 오는 시야를 막음
+    - 방위별로 엄폐 지점에서 출발하는 BFS -> 각 타일의 '가장 가까운 엄폐 쪽 다음 칸'
+    TAKE_COVER는 플레이어 방향 방위로 표만 조회
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        W, H = grid.w, grid.h
+        self.wall_dist, self.wall_near = self._spread([i for i in range(W*H) if grid.cells[i] & WALL])
+        self.cover_next = []
+        self.cover_dist = []
+        for ox, oy in DIRS8:
+            srcs = []
+            for ty in range(H):
+                for tx in range(W):
+                    if self._solid(tx, ty): continue
+                    if 0 <= tx+ox < W and 0 <= ty+oy < H and self._solid(tx+ox, ty+oy):
+                        srcs.append(ty*W+tx)
+            dist, nxt = self._spread(srcs, walkable=True)
+            self.cover_dist.append(dist)
+            self.cover_next.append(nxt)
+
+    def _solid(self, tx, ty):
+        return bool(self.grid.cells[ty*self.grid.w+tx] & WALL)
+
+    def _spread(self, srcs, walkable=False):
+        """
+        다중 출발 8방향 BFS. (거리, 포인터) 반환
+        walkable=False: 포인터 = 가장 가까운 출발 타일 / True: 출발 쪽 다음 칸 (벽 통과 안 함)
+        """
+        W, H = self.grid.w, self.grid.h
+        dist = [-1] * (W*H)
+        ptr = [-1] * (W*H)
+        q = deque()
+        for i in srcs:
+            dist[i] = 0; ptr[i] = i; q.append(i)
+        while q:
+            i = q.popleft()
+            x, y = i % W, i // W
+            for dx, dy in DIRS8:
+                nx, ny = x+dx, y+dy
+                if not (0 <= nx < W and 0 <= ny < H): continue
+                j = ny*W+nx
+                if dist[j] >= 0: continue
+                if walkable:
+                    if self._solid(nx, ny): continue
+                    # 대각선은 양옆이 뚫려 있을 때만 (모서리 끼임 방지)
+                    if dx and dy and (self._solid(x, ny) or self._solid(nx, y)): continue
+                dist[j] = dist[i] + 1
+                ptr[j] = ptr[i] if not walkable else i
+                q.append(j)
+        return dist, ptr
+
+    def _center(self, i):
+        T = self.grid.tile
+        return (i % self.grid.w)*T + T//2, (i // self.grid.w)*T + T//2
+
+    def _index(self, x, y):
+        tx, ty = self.grid.tile_of(x, y)
+        if not self.grid.in_bounds(tx, ty): return -1
+        return ty*self.grid.w+tx
+
+    def wall_dir(self, ex, ey):
+        """가장 가까운 벽 타일 중심 방향 (단위 벡터)"""
+        i = self._index(ex, ey)
+        if i < 0 or self.wall_near[i] < 0: return (0.0, 0.0)
+        cx, cy = self._center(self.wall_near[i])
+        return _unit(cx-ex, cy-ey)
+
+    def cover_dir(self, ex, ey, px, py):
+        """
+        플레이어(px,py) 방향 시야를 막아주는 가장 가까운 엄폐 지점 쪽 이동 방향.
+        엄폐 지점에 도착했으면 그 벽 쪽으로 붙음. 닿을 엄폐가 없으면 가장 가까운 벽 쪽
+        """
+        i = self._index(ex, ey)
+        if i < 0: return (0.0, 0.0)
+        o = octant(px-ex, py-ey)
+        if self.cover_dist[o][i] < 0: return self.wall_dir(ex, ey)
+        if self.cover_dist[o][i] == 0: return _unit(*DIRS8[o])
+        cx, cy = self._center(self.cover_next[o][i])
+        return _unit(cx-ex, cy-ey)
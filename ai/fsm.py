@@ -1,48 +1,10 @@
 from dataclasses import dataclass
 import math
-import random
 
 def _length(vx, vy): return math.hypot(vx, vy)
 def _norm(vx, vy):
     l = _length(vx, vy)
-    return (0.0, 0.0) if l == 0 else (vx/1, vy/1)
-
-def _los(p, e, walls, step=6, maxdist=720):
-    """line-of-sight: 플레이어(p)->적(e) 사이를 샘플링 해 벽 충돌 판정."""
-    px, py = p; ex, ey, = e
-    vx, vy = (px, - ex), (py - ey)
-    dist = math.hypot(vx, vy)
-
-    #아주 가까우면 LOS로 간주(샘플 e개 방지)
-    if dist <= 1e-6:
-        return True
-    
-    # steps는 최소 1
-    steps = max(1, int(min(maxdist, dist) / float(step)))
-
-    dx, dy = vx / steps, vy / steps
-    rx, ry = ex, ey
-
-    # 2x2 작은 직사각형으로 충돌 근사
-    for _ in range(steps):
-        rx += dx; ry += dy
-        r = (int(rx) - 1, int(ry) - 1, 2, 2)
-        for w in walls:
-            if (r[0] < w.right and r[0] + r[2] > w.left and
-                r[1] < w.bottom and r[1] + r[3] > w.top):
-                return False
-    return True
-
-def _nearest_wall_dir(ex, ey, walls):
-    """적 기준 가장 가까운 벽 중심 방향(엄페 쪽으로 움직이기 위함)"""
-    best = None; bd=1e9
-    for w in walls:
-        cx, cy = w.center
-        d = (ex-cx)**2 + (ey-cy)**2
-        if d < bd:
-            bd = d; best = (cx, cy)
-    if not best: return (0.0, 0.0)
-    return _norm(best[0]-ex, best[1]-ey)
+    return (0.0, 0.0) if l == 0 else (vx/l, vy/l)
 
 @dataclass
 class RangedConfig:
@@ -70,7 +32,7 @@ class RangedFSM:
         px, py = world.player.center()
         ex, ey = ent.center()
         dist = _length(px-ex, py-ey)
-        los = _los((px,py), (ex,ey), world.walls)
+        los = world.los.visible((ex,ey), (px,py))
 
         #쿨다운/타이머 감소
         if self.cd > 0: self.cd -= dt
@@ -99,7 +61,7 @@ class RangedFSM:
                     #좌우 스트레이프 방향 갱신
                     fwd = _norm(px-ex, py-ey)
                     # 수직 방향 둘 중 랜덤
-                    self.strafe_dir =( -fwd[1], fwd[0]) if random.random()<0.5 else (fwd[1], -fwd[0])
+                    self.strafe_dir =( -fwd[1], fwd[0]) if world.rng.stream("ai").random()<0.5 else (fwd[1], -fwd[0])
                     self.strafe_t = self.cfg.strafe_time
                 self.state = "STRAFE"
 
@@ -110,8 +72,8 @@ class RangedFSM:
         if self.state == "FLEE":
             dx, dy = _norm(ex-px, ey-py) # 멀어지기
         elif self.state == "TAKE_COVER":
-            #가까운 벽 방향 으로 이동(벽에 바짝 붙어 시야 차단 유도)
-            dx, dy = _nearest_wall_dir(ex, ey, world.walls)
+            #플레이어 쪽 시야를 막아주는 엄폐 지점으로 이동 (레벨별 사전 계산 표 조회)
+            dx, dy = world.cover.cover_dir(ex, ey, px, py)
         elif self.state == "STRAFE":
             dx, dy = self.strafe_dir
         elif self.state == "SHOOT":
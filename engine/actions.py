@@ -1,10 +1,9 @@
 import math
-from engine.projectiles import Projectiles
 from .effects import add_or_stack_poison
 
 def normalize(vx, vy):
     l = (vx*vx+vy*vy) ** 0.5
-    return (0.0, 0.0) if l==0 else (vx/1, vy/1)
+    return (0.0, 0.0) if l==0 else (vx/l, vy/l)
 
 class Weapon:
     def __init__(self, name, cfg: dict):
@@ -17,20 +16,17 @@ class Weapon:
     
     def attack(self, player, world, poison_chance=0.0, poison_add=1.5, poison_tick=0.5, poison_dmg=1):
         t = self.cfg.get("type","melee")
-        px, py = player.ceneter()
+        px, py = player.center()
         hit = False
         if t == "melee":
-            rng = float(self.cfg. get("range", player.attack_range))
+            rng = float(self.cfg.get("range", player.attack_range))
             dmg = int(self.cfg.get("damage", 1))
-            for e in world.enemies + world.ranged:
+            # 공간 해시로 사거리 안 적만 조회
+            for e in world.spatial.query_radius(px, py, rng):
                 if e.alive():
-                    ex, ey = e.center()
-                    dx, dy = (px-ex), (py-ey)
-                    if (dx*dx+dy*dy) ** 0.5 <= rng:
-                        e.hp -= dmg; hit=True
-                        import random
-                        if random.random() < poison_chance:
-                            add_or_stack_poison(e, base_duration=poison_add, dmg_per_tick=poison_dmg, tick=poison_tick, cap_duration=6.0)
+                    e.hp -= dmg; hit=True
+                    if world.rng.stream("combat").random() < poison_chance:
+                        add_or_stack_poison(e, base_duration=poison_add, dmg_per_tick=poison_dmg, tick=poison_tick, cap_duration=6.0)
             if world.boss and world.boss.alive():
                 ex, ey = world.boss.center()
                 dx, dy = (px-ex), (py-ey)
@@ -51,6 +47,6 @@ class Weapon:
                 off = (i - (cnt-1)/2.0) * spread
                 ang = base_ang + off
                 dx, dy = math.cos(ang), math.sin(ang)
-                world.bullets.append(Projectiles(px, py, dx, dy, speed=spd, ttl=2.6, radius=4, dmg=dmg))
+                world.bullets.spawn(px, py, dx, dy, speed=spd, ttl=2.6, radius=4, dmg=dmg)
             hit = True
         return hit
\ No newline at end of file
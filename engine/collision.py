@@ -0,0 +1,50 @@
+def _solid_in(grid, tx0, ty0, tx1, ty1, mask):
+    """타일 범위 안 막힌 타일 x/y 목록"""
+    cells, W = grid.cells, grid.w
+    out = []
+    for ty in range(ty0, ty1+1):
+        for tx in range(tx0, tx1+1):
+            if not (0 <= tx < W and 0 <= ty < grid.h) or cells[ty*W+tx] & mask:
+                out.append((tx, ty))
+    return out
+
+def _steps(d, T):
+    """정수 이동량 d를 한 번에 T 픽셀 이하인 조각으로 나눔 (합은 d 그대로)"""
+    n = max(1, -(-abs(d) // T))
+    return [d*(i+1)//n - d*i//n for i in range(n)]
+
+def move_rect(grid, rect, mvx, mvy, mask=None, rem=None):
+    """
+    축 분리 이동 후 rect가 겹치는 타일만 검사해서 밀어냄 (벽 개수와 무관).
+    한 타일보다 긴 이동은 타일 크기 이하 조각으로 나눠 검사하므로 벽/맵 밖으로 뚫고 나가지 않음.
+    rect를 제자리 수정하고 (x, y, hit_x, hit_y) 반환.
+    mask 미지정이면 grid.solid_mask (벽+문+활성 아레나 도어)
+    rem: [x, y] 서브픽셀 잔여 (정수 rect라 작은 스텝에서 버려지는 이동을 다음 스텝으로 넘김)
+    """
+    T = grid.tile
+    if mask is None: mask = grid.solid_mask
+    if rem is not None:
+        mvx += rem[0]; mvy += rem[1]
+        rem[0] = mvx - int(mvx); rem[1] = mvy - int(mvy)
+    hit_x = hit_y = False
+    if mvx:
+        for d in _steps(int(mvx), T):
+            rect.x += d
+            solid = _solid_in(grid, rect.left//T, rect.top//T, (rect.right-1)//T, (rect.bottom-1)//T, mask)
+            if solid:
+                if mvx > 0: rect.right = min(rect.right, min(tx for tx, _ in solid)*T)
+                else: rect.left = max(rect.left, (max(tx for tx, _ in solid)+1)*T)
+                hit_x = True
+                if rem is not None: rem[0] = 0.0
+                break
+    if mvy:
+        for d in _steps(int(mvy), T):
+            rect.y += d
+            solid = _solid_in(grid, rect.left//T, rect.top//T, (rect.right-1)//T, (rect.bottom-1)//T, mask)
+            if solid:
+                if mvy > 0: rect.bottom = min(rect.bottom, min(ty for _, ty in solid)*T)
+                else: rect.top = max(rect.top, (max(ty for _, ty in solid)+1)*T)
+                hit_y = True
+                if rem is not None: rem[1] = 0.0
+                break
+    return rect.x, rect.y, hit_x, hit_y
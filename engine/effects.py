@@ -37,8 +37,12 @@ class PoisonEffect(StatusEffect):
         self.stack = min(self.max_stacks, self.stacks + 1)
         if add_dur > 0.0:
             self.duration = min(cap_dur if cap_dur is not None else self.duration + add_dur, self.duration + add_dur)
+    def on_apply(self, actor):
+        actor.poisoned = True   # 그리기 쪽은 이 플래그만 봄 (효과 목록 순회 없음)
     def on_tick(self, actor):
         actor.hp = max(0, actor.hp - self.dpt)
+    def on_end(self, actor):
+        actor.poisoned = False
     
 def add_or_stack_poison(actor, base_duration, dmg_per_tick, tick=0.5, cap_duration=6.0):
     for eff in actor.effects:
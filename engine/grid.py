@@ -0,0 +1,118 @@
+#타일 점유 비트
+WALL, DOOR, ARENA = 1, 2, 4
+
+class OccupancyGrid:
+    """
+    타일 인덱스(ty*w+tx) bytearray 점유 격자.
+    레벨 로드 때 한 번 만들고 문 열림/아레나 토글만 제자리 패치.
+    막힘 상태가 바뀔 때마다 version 증가 (캐시 무효화 키),
+    바뀐 타일 인덱스는 changes에 쌓임 (부분 재구축용)
+    """
+    def __init__(self, width, height, tile=32):
+        self.w = width
+        self.h = height
+        self.tile = tile
+        self.cells = bytearray(width*height)
+        self.arena_active = False
+        self.arena_tiles = []
+        self.version = 0
+        self.changes = []
+
+    @classmethod
+    def from_level(cls, level, tile=32):
+        g = cls(max(len(row) for row in level), len(level), tile)
+        for ty, row in enumerate(level):
+            for tx, ch in enumerate(row):
+                if ch == '#': g.cells[ty*g.w+tx] = WALL
+                elif ch == 'D': g.cells[ty*g.w+tx] = DOOR
+                elif ch == 'A': g.cells[ty*g.w+tx] = ARENA
+        g.arena_tiles = [i for i, c in enumerate(g.cells) if c & ARENA]
+        return g
+
+    @property
+    def solid_mask(self):
+        """현재 막힌 것으로 보는 비트 (아레나 도어는 활성 중에만)"""
+        return WALL | DOOR | (ARENA if self.arena_active else 0)
+
+    def in_bounds(self, tx, ty):
+        return 0 <= tx < self.w and 0 <= ty < self.h
+
+    def tile_of(self, x, y):
+        return int(x) // self.tile, int(y) // self.tile
+
+    def blocked(self, tx, ty, mask=None):
+        """격자 밖은 막힘 취급"""
+        if not (0 <= tx < self.w and 0 <= ty < self.h): return True
+        return bool(self.cells[ty*self.w+tx] & (self.solid_mask if mask is None else mask))
+
+    # ---- 제자리 패치 ----
+    def clear_tile(self, tx, ty, flag):
+        if not self.in_bounds(tx, ty): return
+        i = ty*self.w+tx
+        if self.cells[i] & flag:
+            self.cells[i] &= ~flag & 0xFF
+            self.changes.append(i)
+            self.version += 1
+
+    def open_door(self, rect):
+        self.clear_tile(rect.x // self.tile, rect.y // self.tile, DOOR)
+
+    def set_arena(self, active):
+        if self.arena_active != bool(active):
+            self.arena_active = bool(active)
+            self.changes.extend(self.arena_tiles)
+            self.version += 1
+
+    def clear_arena(self):
+        for i in self.arena_tiles: self.cells[i] &= ~ARENA & 0xFF
+        self.changes.extend(self.arena_tiles)
+        self.arena_tiles = []
+        self.version += 1
+
+    def set_rects(self, flag, rects):
+        """flag 비트를 rects 타일로 다시 채움 (세이브 로드 등)"""
+        for i, c in enumerate(self.cells):
+            if c & flag:
+                self.cells[i] = c & ~flag & 0xFF
+                self.changes.append(i)
+        for r in rects:
+            tx, ty = r.x // self.tile, r.y // self.tile
+            if self.in_bounds(tx, ty):
+                self.cells[ty*self.w+tx] |= flag
+                self.changes.append(ty*self.w+tx)
+        if flag & ARENA:
+            self.arena_tiles = [i for i, c in enumerate(self.cells) if c & ARENA]
+        self.version += 1
+
+def traverse(grid, x0, y0, x1, y1, mask=None):
+    """
+    Amanatides-Woo DDA: (x0,y0)->(x1,y1) 선분이 지나는 타일을 순서대로 검사.
+    처음 막힌 타일 (tx, ty, t) 반환 (t: 선분 위 진입 비율 0..1), 없으면 None.
+    격자 밖은 막힘 취급
+    """
+    T = grid.tile
+    if mask is None: mask = grid.solid_mask
+    cells, W, H = grid.cells, grid.w, grid.h
+    tx, ty = int(x0 // T), int(y0 // T)
+    n = abs(int(x1 // T) - tx) + abs(int(y1 // T) - ty)
+    dx, dy = x1 - x0, y1 - y0
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    inf = float("inf")
+    if dx > 0: t_max_x = ((tx+1)*T - x0) / dx
+    elif dx < 0: t_max_x = (tx*T - x0) / dx
+    else: t_max_x = inf
+    if dy > 0: t_max_y = ((ty+1)*T - y0) / dy
+    elif dy < 0: t_max_y = (ty*T - y0) / dy
+    else: t_max_y = inf
+    t_dx = T / abs(dx) if dx else inf
+    t_dy = T / abs(dy) if dy else inf
+    t = 0.0
+    for _ in range(n+1):
+        if not (0 <= tx < W and 0 <= ty < H) or cells[ty*W+tx] & mask:
+            return tx, ty, t
+        if t_max_x < t_max_y:
+            tx += step_x; t = t_max_x; t_max_x += t_dx
+        else:
+            ty += step_y; t = t_max_y; t_max_y += t_dy
+    return None
@@ -0,0 +1,201 @@
+import heapq
+from collections import deque
+
+DIRS4 = ((1,0),(-1,0),(0,1),(0,-1))
+
+class HPAGraph:
+    """
+    HPA*: 타일 격자를 cluster x cluster 칸으로 나누고
+    - 클러스터 경계의 통로(입구) 타일 쌍을 추상 노드로 연결 (inter, 비용 1)
+    - 같은 클러스터 안 입구끼리는 미리 BFS 거리 계산 (intra)
+    길찾기는 추상 그래프 A* 후 구간별로 클러스터 안에서만 다시 펼침.
+    문/아레나 도어 변화는 grid.changes 로 받아 해당 클러스터만 재구축.
+    """
+    def __init__(self, grid, cluster=8):
+        self.grid = grid
+        self.c = cluster
+        self.cw = (grid.w + cluster - 1) // cluster
+        self.ch = (grid.h + cluster - 1) // cluster
+        self.borders = {}   # (ca, cb) -> [(ia, ib), ...]  ca < cb
+        self.inter = {}     # 타일 인덱스 -> {이웃 클러스터 입구 인덱스}
+        self.intra = {}     # 클러스터 -> {입구: {입구: 거리}}
+        self.expanded = 0
+        for cy in range(self.ch):
+            for cx in range(self.cw):
+                c = cy*self.cw+cx
+                if cx+1 < self.cw: self._build_border(c, c+1)
+                if cy+1 < self.ch: self._build_border(c, c+self.cw)
+        for c in range(self.cw*self.ch):
+            self._build_cluster(c)
+        self.version = grid.version
+        self.log_pos = len(grid.changes)
+
+    # ---- 구조 ----
+    def cluster_of(self, i):
+        tx, ty = i % self.grid.w, i // self.grid.w
+        return (ty // self.c)*self.cw + tx // self.c
+
+    def _bounds(self, c):
+        x0, y0 = (c % self.cw)*self.c, (c // self.cw)*self.c
+        return x0, y0, min(self.grid.w, x0+self.c), min(self.grid.h, y0+self.c)
+
+    def _free(self, i):
+        return not (self.grid.cells[i] & self.grid.solid_mask)
+
+    def _border_pairs(self, ca, cb):
+        W = self.grid.w
+        ax0, ay0, ax1, ay1 = self._bounds(ca)
+        if cb == ca + 1 and ca // self.cw == cb // self.cw:
+            x = ax1 - 1
+            return [(y*W+x, y*W+x+1) for y in range(ay0, ay1)]
+        y = ay1 - 1
+        return [(y*W+x, (y+1)*W+x) for x in range(ax0, ax1)]
+
+    def _build_border(self, ca, cb):
+        for ia, ib in self.borders.get((ca, cb), []):
+            self.inter.get(ia, set()).discard(ib)
+            self.inter.get(ib, set()).discard(ia)
+        ents = []
+        run = []
+        for ia, ib in self._border_pairs(ca, cb) + [(None, None)]:
+            if ia is not None and self._free(ia) and self._free(ib):
+                run.append((ia, ib)); continue
+            if run:
+                # 짧은 통로는 가운데 하나, 긴 통로는 양 끝 두 개
+                if len(run) < 6: ents.append(run[len(run)//2])
+                else: ents += [run[0], run[-1]]
+                run = []
+        for ia, ib in ents:
+            self.inter.setdefault(ia, set()).add(ib)
+            self.inter.setdefault(ib, set()).add(ia)
+        self.borders[(ca, cb)] = ents
+
+    def _neighbor_clusters(self, c):
+        cx, cy = c % self.cw, c // self.cw
+        if cx > 0: yield c-1
+        if cx+1 < self.cw: yield c+1
+        if cy > 0: yield c-self.cw
+        if cy+1 < self.ch: yield c+self.cw
+
+    def _entrances(self, c):
+        out = set()
+        for n in self._neighbor_clusters(c):
+            key = (min(c, n), max(c, n))
+            for ia, ib in self.borders.get(key, []):
+                out.add(ia if self.cluster_of(ia) == c else ib)
+        return out
+
+    def _build_cluster(self, c):
+        nodes = self._entrances(c)
+        table = {}
+        for n in nodes:
+            dist, _ = self._local_bfs(n, c)
+            table[n] = {m: dist[m] for m in nodes if m != n and m in dist}
+        self.intra[c] = table
+
+    def _local_bfs(self, src, c, stop=None):
+        """클러스터 c 안에서만 BFS. (dist, prev)"""
+        W = self.grid.w
+        cells, mask = self.grid.cells, self.grid.solid_mask
+        x0, y0, x1, y1 = self._bounds(c)
+        dist = {src: 0}; prev = {src: None}
+        q = deque([src])
+        while q:
+            i = q.popleft()
+            self.expanded += 1
+            if i == stop: break
+            x, y = i % W, i // W
+            for dx, dy in DIRS4:
+                nx, ny = x+dx, y+dy
+                if not (x0 <= nx < x1 and y0 <= ny < y1): continue
+                j = ny*W+nx
+                if j in dist or cells[j] & mask: continue
+                dist[j] = dist[i] + 1; prev[j] = i
+                q.append(j)
+        return dist, prev
+
+    # ---- 부분 재구축 ----
+    def sync(self):
+        """grid.changes 중 새로 쌓인 타일이 속한 클러스터(+경계 이웃)만 재구축"""
+        if self.version == self.grid.version: return
+        W = self.grid.w
+        dirty_c = set(); dirty_b = set()
+        for i in self.grid.changes[self.log_pos:]:
+            c = self.cluster_of(i)
+            dirty_c.add(c)
+            x, y = i % W, i // W
+            x0, y0, x1, y1 = self._bounds(c)
+            if x == x0 and x > 0: dirty_b.add((c-1, c))
+            if x == x1-1 and x1 < W: dirty_b.add((c, c+1))
+            if y == y0 and y > 0: dirty_b.add((c-self.cw, c))
+            if y == y1-1 and y1 < self.grid.h: dirty_b.add((c, c+self.cw))
+        for ca, cb in dirty_b:
+            self._build_border(ca, cb)
+            dirty_c.add(ca); dirty_c.add(cb)
+        for c in dirty_c:
+            self._build_cluster(c)
+        self.version = self.grid.version
+        self.log_pos = len(self.grid.changes)
+
+    # ---- 길찾기 ----
+    def find_path(self, start, goal):
+        """start/goal: (tx, ty). start 제외 타일 경로, 없으면 []"""
+        self.sync()
+        W = self.grid.w
+        if not (self.grid.in_bounds(*start) and self.grid.in_bounds(*goal)): return []
+        s, g = start[1]*W+start[0], goal[1]*W+goal[0]
+        if s == g or not self._free(s) or not self._free(g): return []
+        cs, cg = self.cluster_of(s), self.cluster_of(g)
+        if cs == cg:
+            local = self._local_path(s, g, cs)
+            if local: return [(i % W, i // W) for i in local]
+        # 시작/목표를 임시 노드로 연결
+        s_dist, _ = self._local_bfs(s, cs)
+        g_dist, _ = self._local_bfs(g, cg)
+        s_edges = {n: s_dist[n] for n in self._entrances(cs) if n in s_dist}
+        g_edges = {n: g_dist[n] for n in self._entrances(cg) if n in g_dist}
+        if cs == cg and g in s_dist: s_edges[g] = s_dist[g]
+
+        gx, gy = goal
+        def h(i): return abs(i % W - gx) + abs(i // W - gy)
+        best = {s: 0}; prev = {s: None}
+        heap = [(h(s), 0, s)]
+        while heap:
+            _, d, i = heapq.heappop(heap)
+            if i == g: break
+            if d > best.get(i, 1 << 30): continue
+            self.expanded += 1
+            if i == s: edges = list(s_edges.items())
+            else: edges = list(self.intra.get(self.cluster_of(i), {}).get(i, {}).items())
+            edges += [(j, 1) for j in self.inter.get(i, ())]
+            if i in g_edges: edges.append((g, g_edges[i]))
+            for j, w in edges:
+                nd = d + w
+                if nd < best.get(j, 1 << 30):
+                    best[j] = nd; prev[j] = i
+                    heapq.heappush(heap, (nd + h(j), nd, j))
+        if g not in prev: return []
+
+        nodes = []
+        cur = g
+        while cur is not None:
+            nodes.append(cur); cur = prev[cur]
+        nodes.reverse()
+        path = []
+        for a, b in zip(nodes, nodes[1:]):
+            if b in self.inter.get(a, ()):
+                path.append(b)
+            else:
+                path += self._local_path(a, b, self.cluster_of(a))
+        return [(i % W, i // W) for i in path]
+
+    def _local_path(self, a, b, c):
+        """클러스터 안 a->b 타일 인덱스 경로 (a 제외)"""
+        _, prev = self._local_bfs(a, c, stop=b)
+        if b not in prev: return []
+        out = []
+        cur = b
+        while cur != a:
+            out.append(cur); cur = prev[cur]
+        out.reverse()
+        return out
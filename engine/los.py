@@ -0,0 +1,34 @@
+from engine.grid import WALL, traverse
+
+class LineOfSight:
+    """
+    점유 격자 DDA 시야 판정 + 프레임 캐시.
+    키는 (관찰자 타일, 대상 타일, 격자 version) 이고 판정도 두 타일 중심 사이로 하므로
+    같은 칸에 모인 적들은 한 번 계산한 결과를 공유함. begin_frame()에서 비움
+    """
+    def __init__(self, grid, mask=WALL):
+        self.grid = grid
+        self.mask = mask
+        self.cache = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def begin_frame(self):
+        self.cache.clear()
+
+    def visible(self, a, b):
+        """a, b: 픽셀 좌표. 사이에 mask 타일이 없으면 True"""
+        g = self.grid
+        T = g.tile
+        ta = (int(a[0]) // T, int(a[1]) // T)
+        tb = (int(b[0]) // T, int(b[1]) // T)
+        key = (ta, tb, g.version)
+        res = self.cache.get(key)
+        if res is not None:
+            self.stats["hits"] += 1
+            return res
+        self.stats["misses"] += 1
+        h = T // 2
+        res = traverse(g, ta[0]*T+h, ta[1]*T+h, tb[0]*T+h, tb[1]*T+h, self.mask) is None
+        self.cache[key] = res
+        self.cache[(tb, ta, g.version)] = res    # 대칭
+        return res
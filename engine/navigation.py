@@ -0,0 +1,66 @@
+from collections import deque
+
+DIRS4 = ((1,0),(-1,0),(0,1),(0,-1))
+
+class FlowField:
+    """
+    목표(플레이어) 타일에서 바깥으로 퍼지는 거리장.
+    - 모든 이동 비용이 1인 4방향 격자라 BFS 확산 = Dijkstra
+    - 각 타일에 '목표 쪽 다음 타일'을 저장해서 적은 O(1) 조회만 함
+    - 목표 타일이나 격자 version이 바뀔 때만 다시 계산
+    - max_dist를 주면 그 거리까지만 확산 (큰 맵에서 재계산 비용 제한)
+    """
+    def __init__(self, width, height, max_dist=None):
+        self.w = width
+        self.h = height
+        self.max_dist = max_dist
+        self.goal = None
+        self.key = None
+        self.dist = [-1] * (width*height)
+        self.next = [-1] * (width*height)
+        self.builds = 0
+
+    def stale(self, goal, key):
+        return goal != self.goal or key != self.key
+
+    def build(self, goal, key, grid):
+        """grid: OccupancyGrid (현재 solid_mask 기준으로 막힘 판정)"""
+        W, H = self.w, self.h
+        cells, mask = grid.cells, grid.solid_mask
+        limit = self.max_dist if self.max_dist is not None else W*H
+        dist = [-1] * (W*H)
+        nxt = [-1] * (W*H)
+        gx, gy = goal
+        if 0 <= gx < W and 0 <= gy < H:
+            dist[gy*W+gx] = 0
+            q = deque([goal])
+            while q:
+                x, y = q.popleft()
+                i = y*W+x
+                d = dist[i] + 1
+                if d > limit: continue
+                for dx, dy in DIRS4:
+                    nx, ny = x+dx, y+dy
+                    if not (0 <= nx < W and 0 <= ny < H): continue
+                    j = ny*W+nx
+                    if dist[j] >= 0 or cells[j] & mask: continue
+                    dist[j] = d
+                    nxt[j] = i
+                    q.append((nx, ny))
+        self.goal = goal
+        self.key = key
+        self.dist = dist
+        self.next = nxt
+        self.builds += 1
+
+    def distance(self, tx, ty):
+        """목표까지 타일 거리. 범위 밖/도달 불가면 -1"""
+        if not (0 <= tx < self.w and 0 <= ty < self.h): return -1
+        return self.dist[ty*self.w+tx]
+
+    def next_tile(self, tx, ty):
+        """(tx, ty)에서 목표 쪽으로 한 칸. 목표 위/도달 불가면 None"""
+        if not (0 <= tx < self.w and 0 <= ty < self.h): return None
+        j = self.next[ty*self.w+tx]
+        if j < 0: return None
+        return j % self.w, j // self.w
@@ -0,0 +1,155 @@
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+
+DIRS4 = ((1,0),(-1,0),(0,1),(0,-1))
+
+@dataclass
+class PathResult:
+    path: list = field(default_factory=list)    # start 제외 타일 목록
+    length: int = 0
+    expanded: int = 0
+    backend: str = "bfs"
+
+def _free(grid, x, y, mask):
+    return 0 <= x < grid.w and 0 <= y < grid.h and not (grid.cells[y*grid.w+x] & mask)
+
+def _unwind(prev, goal):
+    out = []
+    cur = goal
+    while prev[cur] is not None:
+        out.append(cur); cur = prev[cur]
+    out.reverse()
+    return out
+
+# ---- 백엔드 ----
+def bfs(grid, start, goal):
+    mask = grid.solid_mask
+    prev = {start: None}
+    q = deque([start])
+    expanded = 0
+    while q:
+        x, y = q.popleft()
+        expanded += 1
+        if (x, y) == goal: break
+        for dx, dy in DIRS4:
+            n = (x+dx, y+dy)
+            if n in prev or not _free(grid, n[0], n[1], mask): continue
+            prev[n] = (x, y)
+            q.append(n)
+    if goal not in prev: return PathResult(expanded=expanded, backend="bfs")
+    path = _unwind(prev, goal)
+    return PathResult(path, len(path), expanded, "bfs")
+
+def astar(grid, start, goal):
+    """맨해튼 휴리스틱 A*"""
+    mask = grid.solid_mask
+    gx, gy = goal
+    g = {start: 0}; prev = {start: None}
+    heap = [(abs(start[0]-gx) + abs(start[1]-gy), 0, start)]
+    expanded = 0
+    while heap:
+        _, d, cur = heapq.heappop(heap)
+        if d > g[cur]: continue
+        expanded += 1
+        if cur == goal: break
+        x, y = cur
+        for dx, dy in DIRS4:
+            n = (x+dx, y+dy)
+            if not _free(grid, n[0], n[1], mask): continue
+            if d + 1 < g.get(n, 1 << 30):
+                g[n] = d + 1; prev[n] = cur
+                heapq.heappush(heap, (d + 1 + abs(n[0]-gx) + abs(n[1]-gy), d + 1, n))
+    if goal not in prev: return PathResult(expanded=expanded, backend="astar")
+    path = _unwind(prev, goal)
+    return PathResult(path, len(path), expanded, "astar")
+
+def _jump_h(grid, x, y, dx, goal, mask):
+    """가로 점프: 목표 또는 강제 이웃(세로)이 생기는 칸에서 멈춤"""
+    while True:
+        x += dx
+        if not _free(grid, x, y, mask): return None
+        if (x, y) == goal: return (x, y)
+        for dy in (-1, 1):
+            if _free(grid, x, y+dy, mask) and not _free(grid, x-dx, y+dy, mask):
+                return (x, y)
+
+def _jump_v(grid, x, y, dy, goal, mask):
+    """세로 점프: 매 칸 양옆 가로 점프가 점프 포인트를 찾으면 멈춤"""
+    while True:
+        y += dy
+        if not _free(grid, x, y, mask): return None
+        if (x, y) == goal: return (x, y)
+        if _jump_h(grid, x, y, 1, goal, mask) or _jump_h(grid, x, y, -1, goal, mask):
+            return (x, y)
+
+def _jps_dirs(grid, node, parent, mask):
+    """세로 우선 정규 순서: 세로 진행은 가로로 자유롭게 꺾고, 가로 진행은 강제 이웃에서만 꺾음"""
+    if parent is None: return DIRS4
+    x, y = node
+    dx = (x > parent[0]) - (x < parent[0])
+    dy = (y > parent[1]) - (y < parent[1])
+    if dx == 0: return ((0, dy), (1, 0), (-1, 0))
+    out = [(dx, 0)]
+    for vy in (-1, 1):
+        if _free(grid, x, y+vy, mask) and not _free(grid, x-dx, y+vy, mask):
+            out.append((0, vy))
+    return out
+
+def jps(grid, start, goal):
+    """4방향 균일 비용 격자용 Jump Point Search (A* + 맨해튼)"""
+    mask = grid.solid_mask
+    gx, gy = goal
+    g = {start: 0}; prev = {start: None}
+    heap = [(abs(start[0]-gx) + abs(start[1]-gy), 0, start)]
+    expanded = 0
+    while heap:
+        _, d, cur = heapq.heappop(heap)
+        if d > g[cur]: continue
+        expanded += 1
+        if cur == goal: break
+        x, y = cur
+        for dx, dy in _jps_dirs(grid, cur, prev[cur], mask):
+            if dy == 0: jp = _jump_h(grid, x, y, dx, goal, mask)
+            else: jp = _jump_v(grid, x, y, dy, goal, mask)
+            if jp is None: continue
+            nd = d + abs(jp[0]-x) + abs(jp[1]-y)
+            if nd < g.get(jp, 1 << 30):
+                g[jp] = nd; prev[jp] = cur
+                heapq.heappush(heap, (nd + abs(jp[0]-gx) + abs(jp[1]-gy), nd, jp))
+    if goal not in prev: return PathResult(expanded=expanded, backend="jps")
+    # 점프 포인트 사이 직선 구간 펼치기
+    path = []
+    x, y = start
+    for jx, jy in _unwind(prev, goal):
+        sx = (jx > x) - (jx < x); sy = (jy > y) - (jy < y)
+        while (x, y) != (jx, jy):
+            x += sx; y += sy
+            path.append((x, y))
+    return PathResult(path, len(path), expanded, "jps")
+
+BACKENDS = {"bfs": bfs, "astar": astar, "jps": jps}
+BACKEND_NAMES = tuple(BACKENDS) + ("hpa",)
+
+def find_path(grid, start, goal, backend="bfs", hpa=None):
+    """
+    start/goal: (tx, ty). backend: bfs | astar | jps | hpa (hpa는 HPAGraph 필요)
+    막힌 시작/목표나 경로 없음은 빈 PathResult. 모르는 backend나 hpa 없는 "hpa"는 ValueError
+    """
+    if backend not in BACKEND_NAMES:
+        raise ValueError(f"unknown path backend: {backend!r} (expected one of {', '.join(BACKEND_NAMES)})")
+    if backend == "hpa" and hpa is None:
+        raise ValueError("path backend 'hpa' needs an HPAGraph")
+    mask = grid.solid_mask
+    if start == goal or not _free(grid, *start, mask) or not _free(grid, *goal, mask):
+        return PathResult(backend=backend)
+    if backend == "hpa":
+        before = hpa.expanded
+        path = hpa.find_path(start, goal)
+        return PathResult(path, len(path), hpa.expanded - before, "hpa")
+    return BACKENDS[backend](grid, start, goal)
+
+def compare(grid, start, goal, hpa=None):
+    """백엔드별 결과 비교용 {이름: PathResult}"""
+    names = list(BACKENDS) + (["hpa"] if hpa is not None else [])
+    return {n: find_path(grid, start, goal, n, hpa) for n in names}
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict, deque
+from engine.pathfinding import find_path
+
+class PathService:
+    """
+    중앙 경로 요청 처리기.
+    - 결과 캐시 키: (시작 타일, 목표 타일, 격자 version, 백엔드) -> 같은 칸 적은 한 결과 공유
+    - update() 한 번에 노드 예산 안에서만 풀고 남은 요청은 다음 프레임으로 이월.
+      budget_ms(벽시계 예산)는 기본 꺼짐: 켜면 처리량이 기계 부하에 따라 달라져 시뮬레이션이 재현되지 않음
+    - 같은 키 요청이 대기 중이면 한 번만 계산해서 모두에게 전달
+    """
+    def __init__(self, grid, hpa=None, budget_nodes=1500, budget_ms=None, cache_size=256):
+        self.grid = grid
+        self.hpa = hpa
+        self.budget_nodes = budget_nodes
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.version = grid.version
+        self.queue = deque()    # 대기 키 (FIFO)
+        self.waiting = {}       # 키 -> [요청자]
+        self.wanted = {}        # 요청자 -> 마지막으로 요청한 키
+        self.ready = {}         # 요청자 -> PathResult
+        self.stats = {"hits": 0, "misses": 0, "solved": 0, "carried": 0}
+
+    def _sync(self):
+        if self.version != self.grid.version:
+            self.cache.clear()
+            self.version = self.grid.version
+
+    def request(self, owner, start, goal, backend="bfs"):
+        """캐시에 있으면 바로 PathResult, 아니면 큐에 넣고 None (나중에 take)"""
+        self._sync()
+        key = (start, goal, self.version, backend)
+        res = self.cache.get(key)
+        if res is not None:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            self.wanted.pop(owner, None)
+            return res
+        self.stats["misses"] += 1
+        self.wanted[owner] = key
+        if key not in self.waiting:
+            self.waiting[key] = []
+            self.queue.append(key)
+        self.waiting[key].append(owner)
+        return None
+
+    def take(self, owner):
+        """update()에서 풀린 결과가 있으면 꺼내줌"""
+        return self.ready.pop(owner, None)
+
+    def update(self):
+        """예산 안에서 대기 요청 처리 (최소 1개는 처리해서 굶지 않게)"""
+        self._sync()
+        t0 = time.perf_counter()
+        nodes = 0
+        done = 0
+        while self.queue:
+            if done and (nodes >= self.budget_nodes or
+                         (self.budget_ms is not None and (time.perf_counter() - t0)*1000.0 >= self.budget_ms)):
+                break
+            key = self.queue.popleft()
+            owners = self.waiting.pop(key, [])
+            start, goal, version, backend = key
+            if version != self.version:
+                # 막힘 상태가 바뀐 뒤의 낡은 요청: 지금 격자 기준으로 다시 풂
+                key = (start, goal, self.version, backend)
+            res = self.cache.get(key)
+            if res is None:
+                res = find_path(self.grid, start, goal, backend, hpa=self.hpa)
+                nodes += res.expanded
+                self.cache[key] = res
+                if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+                self.stats["solved"] += 1
+            done += 1
+            for o in owners:
+                if self.wanted.get(o) in (key, (start, goal, version, backend)):
+                    del self.wanted[o]
+                    self.ready[o] = res
+        self.stats["carried"] = len(self.queue)
@@ -1,5 +1,7 @@
 import math
+import numpy as np
 import pygame
+from engine.grid import WALL, traverse
 
 def clamp(v, lo, hi):
     return lo if v < lo else hi if v > hi else v
@@ -11,7 +13,7 @@ def normalize(vx, vy):
     l = length(vx, vy)
     if l == 0:
         return 0.0, 0.0
-    return vx / 1, vy / 1
+    return vx / l, vy / l
 
 def point_segment_distance(p, a, b):
     px, py = p
@@ -26,7 +28,18 @@ def point_segment_distance(p, a, b):
     cx, cy = ax + abx * t, ay + aby * t
     return math.hypot(px - cx, py- cy)
 
+def segment_distances(points, a, b):
+    """점 m개 x 선분 n개 거리 행렬 (m, n). points/a/b: (m,2)/(n,2)/(n,2) 배열"""
+    p = np.asarray(points, dtype=np.float64)[:, None, :]
+    a = np.asarray(a, dtype=np.float64)[None, :, :]
+    ab = np.asarray(b, dtype=np.float64)[None, :, :] - a
+    ab2 = (ab * ab).sum(axis=2)
+    t = np.where(ab2 > 0, ((p - a) * ab).sum(axis=2) / np.where(ab2 > 0, ab2, 1.0), 0.0)
+    c = a + ab * np.clip(t, 0.0, 1.0)[..., None]
+    return np.hypot(p[..., 0] - c[..., 0], p[..., 1] - c[..., 1])
+
 class Projectiles:
+    """탄 하나의 초기값 묶음. 이동/충돌은 BulletPool이 처리 (BulletPool.append로 넘김)"""
     def __init__(self, x, y, dx, dy, speed=220, ttl=2.5, radius=4, dmg=1, homing=False, turn_rate=2.0):
         self.x = float(x)
         self.y = float(y)
@@ -40,32 +53,113 @@ class Projectiles:
         self.homing = bool(homing)
         self.turn_rate = float(turn_rate)
         self.alive = True
-    def update(self, dt, walls, player_pos=None):
-        if not self.alive:
-            return
-        if self.homing and player_pos:
+
+class BulletPool:
+    """
+    struct-of-arrays 탄 풀. 위치/방향/속도/TTL/반경/데미지/유도/생존을 미리 잡은 NumPy 배열에 두고
+    이동, 유도 조향, TTL 만료, 벽 판정, 플레이어 겹침을 각각 한 번의 벡터 연산으로 처리.
+    죽은 슬롯은 free 리스트로 재사용, 부족하면 용량 두 배로 늘림
+    """
+    def __init__(self, capacity=1024):
+        self.cap = 0
+        self.free = []
+        self._grow(capacity)
+
+    def _grow(self, cap):
+        old = self.cap
+        def ext(arr, dtype):
+            out = np.zeros(cap, dtype=dtype)
+            if arr is not None: out[:old] = arr
+            return out
+        g = lambda name: getattr(self, name, None)
+        self.x = ext(g("x"), np.float64); self.y = ext(g("y"), np.float64)
+        self.px = ext(g("px"), np.float64); self.py = ext(g("py"), np.float64)   # 직전 스텝 위치 (보간용)
+        self.dx = ext(g("dx"), np.float64); self.dy = ext(g("dy"), np.float64)
+        self.speed = ext(g("speed"), np.float64); self.ttl = ext(g("ttl"), np.float64)
+        self.radius = ext(g("radius"), np.int32); self.dmg = ext(g("dmg"), np.int32)
+        self.homing = ext(g("homing"), np.bool_); self.turn = ext(g("turn"), np.float64)
+        self.alive = ext(g("alive"), np.bool_)
+        self.free.extend(range(cap-1, old-1, -1))
+        self.cap = cap
+
+    def spawn(self, x, y, dx, dy, speed=220, ttl=2.5, radius=4, dmg=1, homing=False, turn_rate=2.0):
+        if not self.free: self._grow(self.cap*2)
+        i = self.free.pop()
+        l = math.hypot(dx, dy) or 1.0
+        self.x[i] = x; self.y[i] = y
+        self.px[i] = x; self.py[i] = y
+        self.dx[i] = dx / l; self.dy[i] = dy / l
+        self.speed[i] = speed; self.ttl[i] = ttl
+        self.radius[i] = radius; self.dmg[i] = dmg
+        self.homing[i] = homing; self.turn[i] = turn_rate
+        self.alive[i] = True
+        return i
+
+    def append(self, b):
+        """Projectiles 객체 호환 (모드/구 코드용)"""
+        if b.alive:
+            self.spawn(b.x, b.y, b.dx, b.dy, b.speed, b.ttl, b.radius, b.dmg, b.homing, b.turn_rate)
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.cap-1, -1, -1))
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def update(self, dt, grid, player_pos, player_rect):
+        """한 프레임 진행. 플레이어에 맞은 탄들의 데미지 목록 반환 (맞은 탄은 소멸)"""
+        alive = self.alive
+        was = alive.copy()
+        # 유도 조향
+        h = alive & self.homing
+        if h.any():
             px, py = player_pos
-            vx, vy = px - self.x, py - self.y
-            tx, ty = normalize(vx, vy)
-            ang_cur = math.atan2(self.dy, self.dx)
-            ang_tgt = math.atan2(ty, tx)
-            diff = (ang_tgt - ang_cur + math.pi) % (2 * math.pi) - math.pi
-            ang_cur += max(-self.turn_rate * dt, min(self.turn_rate * dt, diff))
-            self.dx, self.dy = math.cos(ang_cur, math.sin(ang_cur))
+            cur = np.arctan2(self.dy[h], self.dx[h])
+            tgt = np.arctan2(py - self.y[h], px - self.x[h])
+            diff = (tgt - cur + math.pi) % (2*math.pi) - math.pi
+            lim = self.turn[h] * dt
+            cur += np.clip(diff, -lim, lim)
+            self.dx[h] = np.cos(cur); self.dy[h] = np.sin(cur)
+        # 이동 + TTL (이동 전 위치는 그리기 보간용으로 남김)
+        ox, oy = self.x.copy(), self.y.copy()
+        self.px, self.py = ox, oy
         self.x += self.dx * self.speed * dt
         self.y += self.dy * self.speed * dt
         self.ttl -= dt
-        if self.ttl <= 0:
-            self.alive = False
-            return
-        r = pygame.Rect(int(self.x) - self.radius, int(self.y) - self.radius, self.radius * 2, self.radius * 2)
-        for w in walls:
-            if r.colliderect(w):
-                self.alive = False
-                break
-    def rect(self):
-        return pygame.Rect(int(self.x) - self.radius, int(self.y) - self.radius, self.radius * 2, self.radius * 2)
-    
+        alive &= self.ttl > 0
+        # 벽: 이번 이동에서 타일 경계를 넘은 탄만 DDA(traverse)로 정확히 따라감.
+        # 같은 타일 안에서만 움직인 탄은 새 벽 타일에 들어갈 수 없으므로 건너뜀
+        if alive.any():
+            T = grid.tile
+            idx = np.flatnonzero(alive)
+            moved = (np.floor(ox[idx] / T) != np.floor(self.x[idx] / T)) | (np.floor(oy[idx] / T) != np.floor(self.y[idx] / T))
+            for i in idx[moved].tolist():
+                x0, y0, x1, y1 = float(ox[i]), float(oy[i]), float(self.x[i]), float(self.y[i])
+                hit = traverse(grid, x0, y0, x1, y1, WALL)
+                if hit:
+                    t = hit[2]
+                    self.x[i] = x0 + (x1 - x0) * t; self.y[i] = y0 + (y1 - y0) * t
+                    alive[i] = False
+        # 플레이어 겹침 (탄 사각형 vs 플레이어 rect)
+        xi = self.x.astype(np.int64); yi = self.y.astype(np.int64); r = self.radius
+        hit = alive & (xi - r < player_rect.right) & (xi + r > player_rect.left) \
+                    & (yi - r < player_rect.bottom) & (yi + r > player_rect.top)
+        dmgs = self.dmg[hit].tolist()
+        alive &= ~hit
+        self.free.extend(np.flatnonzero(was & ~alive).tolist())
+        return dmgs
+
+    def draw_list(self, alpha=1.0):
+        """살아있는 탄 (x, y, radius) 목록. alpha<1이면 직전 스텝 위치와 보간"""
+        idx = np.flatnonzero(self.alive)
+        x, y = self.x[idx], self.y[idx]
+        if alpha < 1.0:
+            x = self.px[idx] + (x - self.px[idx]) * alpha
+            y = self.py[idx] + (y - self.py[idx]) * alpha
+        return zip(x.astype(np.int64).tolist(), y.astype(np.int64).tolist(),
+                   self.radius[idx].tolist())
+
 class LaserBeam:
     def __init__(self, x, y, angle, warn_time=0.8, active_time=1.0, length=280, width=8, warn_color=(255,200,120), beam_color=(255,70,70)):
         self.x = float(x)
@@ -79,53 +173,54 @@ class LaserBeam:
         self.end = None
         self.warn_color = warn_color
         self.beam_color = beam_color
-    def _raycast(self, walls):
-        steps = int(self.len / 6)
-        px, py = self.x, self.y
+        self.hot = False    # 이번 프레임 피격 판정 대상 (laser_hits에서 사용)
+    def _raycast(self, grid):
+        """DDA로 빔 경로 타일을 따라가 첫 벽 진입 지점에서 끝점 확정"""
         dx, dy = math.cos(self.ang), math.sin(self.ang)
-        endx, endy = px + dx * self.len, py + dy * self.len
-        seg = pygame.Rect(0, 0, 4, 4)
-        for i in range(1, steps + 1):
-            cx, cy = px + dx * (self.len * i / steps), py + dy (self.len * i / steps)
-            seg.center = (int(cx), int(cy))
-            if any(seg.colliderect(w) for w in walls):
-                endx, endy = cx, cy
-                break
+        endx, endy = self.x + dx * self.len, self.y + dy * self.len
+        hit = traverse(grid, self.x, self.y, endx, endy, WALL)
+        if hit:
+            t = hit[2]
+            endx, endy = self.x + dx * self.len * t, self.y + dy * self.len * t
         self.end = (endx, endy)
-    def update(self, dt, walls, player, player_radius):
+    def update(self, dt, grid):
+        """타이머 진행. 활성 구간 프레임이면 hot=True (판정은 laser_hits로 일괄)"""
+        self.hot = False
         if self.done:
             return
         if self.end is None:
-            self._raycast(walls)
+            self._raycast(grid)
         if self.warn > 0:
             self.warn -= dt
             if self.warn <= 0:
                 self.warn = 0
         elif self.active > 0:
             self.active -= dt
-            sx, sy = self.x, self.y
-            ex, ey = self.end
-            dist = point_segment_distance(player, (sx, sy), (ex, ey))
-            if dist <= player_radius + self.width * 0.5:
-                return True
+            self.hot = True
             if self.active <= 0:
                 self.active = 0
                 self.done = True
         else:
             self.done = True
-        return False
-    def draw(self, screen):
+    def bounds(self):
+        """빔 선분을 덮는 사각형 (화면 밖 컬링용)"""
+        ex, ey = self.end if self.end else (self.x, self.y)
+        x0, y0 = min(self.x, ex), min(self.y, ey)
+        w = self.width
+        return pygame.Rect(int(x0) - w, int(y0) - w, int(abs(ex - self.x)) + 2*w, int(abs(ey - self.y)) + 2*w)
+    def draw(self, screen, offset=(0, 0)):
         if self.done:
             return
-        sx, sy = int(self.x), int(self.y)
-        ex, ey = (int(self.end[0]), int(self.end[1])) if self.end else (sx, sy)
+        ox, oy = offset
+        sx, sy = int(self.x) - ox, int(self.y) - oy
+        ex, ey = (int(self.end[0]) - ox, int(self.end[1]) - oy) if self.end else (sx, sy)
         if self.warn > 0:
             dash_len = 10
-            total = max(1, int(length(ex, sx, ey, sy) // dash_len))
+            total = max(1, int(length(ex - sx, ey - sy) // dash_len))
             for i in range(0, total, 2):
                 t0 = i / total
-                t1 = min(1, (i + i) / total)
-                x0 = int(sx + (ex - ex) * t0)
+                t1 = min(1, (i + 1) / total)
+                x0 = int(sx + (ex - sx) * t0)
                 y0 = int(sy + (ey - sy) * t0)
                 x1 = int(sx + (ex - sx) * t1)
                 y1 = int(sy + (ey - sy) * t1)
@@ -133,6 +228,20 @@ class LaserBeam:
         else:
             pygame.draw.line(screen, self.beam_color, (sx, sy), (ex, ey), self.width)
 
+def laser_hits(lasers, points, radii):
+    """
+    이번 프레임 활성(hot) 레이저 전부 vs 원(중심, 반경) 목록을 한 번에 판정.
+    원별로 어느 레이저에든 맞았는지 bool 배열 반환 (플레이어/적 공용)
+    """
+    hot = [lz for lz in lasers if lz.hot]
+    if not hot or not len(points):
+        return np.zeros(len(points), dtype=bool)
+    a = [(lz.x, lz.y) for lz in hot]
+    b = [lz.end for lz in hot]
+    half_w = np.array([lz.width * 0.5 for lz in hot])
+    d = segment_distances(points, a, b)
+    return (d <= np.asarray(radii, dtype=np.float64)[:, None] + half_w[None, :]).any(axis=1)
+
 def fan_dirs(base_dx, base_dy, count, spread_rad):
     dirs = []
     b = math.atan2(base_dy, base_dx)
@@ -0,0 +1,29 @@
+import hashlib
+import random
+
+class RngRegistry:
+    """
+    런 시드 하나에서 서브시스템별 random.Random 스트림을 파생.
+    - stream(name): 이름마다 독립 시드 (run seed + 이름 해시). 처음 요청할 때 만들고 이후 같은 객체
+    - 스트림끼리 상태를 공유하지 않으므로 렌더링(fx)에서 난수를 몇 번 뽑든 시뮬레이션 쪽 순서는 그대로
+    - seed=None이면 OS 난수로 런 시드를 정함 (seed 속성으로 확인해 재현 가능)
+    """
+    def __init__(self, seed=None):
+        self.seed = random.SystemRandom().randrange(1 << 63) if seed is None else int(seed)
+        self.streams = {}
+
+    def derive(self, name):
+        """이름별 파생 시드 (프로세스/파이썬 해시 시드와 무관하게 고정)"""
+        h = hashlib.blake2b(f"{self.seed}/{name}".encode(), digest_size=8)
+        return int.from_bytes(h.digest(), "little")
+
+    def reseed(self, seed):
+        """런 시드 교체. 이미 나눠준 스트림 객체는 그대로 두고 새 파생 시드로 다시 맞춤"""
+        self.seed = int(seed)
+        for name, r in self.streams.items(): r.seed(self.derive(name))
+
+    def stream(self, name):
+        r = self.streams.get(name)
+        if r is None:
+            r = self.streams[name] = random.Random(self.derive(name))
+        return r
@@ -1,4 +1,7 @@
 import json
+import warnings
+
+from .pathfinding import BACKEND_NAMES
 
 def load_json_safe(path, default):
     try:
@@ -29,7 +32,12 @@ def load_levels_v1_or_fallback(path, fallback_maps):
             m = lv.get("map")
             if not m:
                 continue
-            lvls.append({"map": m, "elite_rate": float(lv.get("elite_rate", 0.2))})
+            entry = {"map": m, "elite_rate": float(lv.get("elite_rate", 0.2))}
+            backend = lv.get("path_backend")
+            if backend:
+                if str(backend) in BACKEND_NAMES: entry["path_backend"] = str(backend)
+                else: warnings.warn(f"{path}: unknown path_backend {backend!r} ignored (expected one of {', '.join(BACKEND_NAMES)})")
+            lvls.append(entry)
         return lvls or [{"map": m, "elite_rate": 0.2} for m in fallback_maps]
     if isinstance(data, list):
         return [{"map":m, "elite_rate": 0.2} for m in data]
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field, replace
+
+@dataclass
+class SimInput:
+    """
+    한 시뮬레이션 스텝 입력. 키보드/스크립트 정책/리플레이 어느 쪽에서 만들어도 같음
+    - move: (-1..1, -1..1) 이동 방향
+    - attack/skill1: 누른 순간 한 번만 처리되는 동작 (held()로 다음 스텝에서 지움)
+    - shop_open: 상점 창이 열려 있으면 줍기/문 상호작용 정지
+    """
+    move: tuple = (0, 0)
+    attack: bool = False
+    skill1: bool = False
+    shop_open: bool = False
+
+    def held(self):
+        """같은 프레임의 다음 스텝용: 한 번만 처리할 동작을 뺀 입력"""
+        return replace(self, attack=False, skill1=False)
+
+@dataclass
+class SimEvent:
+    """스텝 중 발생한 일. 메타 진행/화면 흔들림/사운드 등은 호출 쪽이 구독해서 처리"""
+    name: str
+    data: dict = field(default_factory=dict)
@@ -0,0 +1,75 @@
+import math
+
+class SpatialHash:
+    """
+    균일 격자 공간 해시. 액터 중심 좌표로 버킷에 넣고
+    반경/사각형/최근접 k 조회는 주변 버킷만 훑음 (전체 적 수가 아니라 국소 밀도에 비례)
+    """
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.buckets = {}
+        self.max_half = 0   # 사각형 조회 시 버킷 범위를 넓힐 최대 반폭
+
+    def clear(self):
+        self.buckets.clear()
+        self.max_half = 0
+
+    def insert(self, a):
+        cx, cy = a.center()
+        key = (int(cx) // self.cell, int(cy) // self.cell)
+        self.buckets.setdefault(key, []).append(a)
+        half = max(a.rect.w, a.rect.h) // 2 + 1
+        if half > self.max_half: self.max_half = half
+
+    def rebuild(self, actors):
+        self.clear()
+        for a in actors:
+            if a.alive(): self.insert(a)
+
+    def _cells(self, x0, y0, x1, y1):
+        c = self.cell
+        for ky in range(int(y0) // c, int(y1) // c + 1):
+            for kx in range(int(x0) // c, int(x1) // c + 1):
+                b = self.buckets.get((kx, ky))
+                if b: yield b
+
+    def query_radius(self, x, y, r):
+        """중심 거리 <= r 인 액터"""
+        r2 = r*r
+        out = []
+        for b in self._cells(x-r, y-r, x+r, y+r):
+            for a in b:
+                ax, ay = a.center()
+                if (ax-x)**2 + (ay-y)**2 <= r2: out.append(a)
+        return out
+
+    def query_rect(self, rect):
+        """rect와 겹치는 액터"""
+        m = self.max_half
+        out = []
+        for b in self._cells(rect.left-m, rect.top-m, rect.right+m, rect.bottom+m):
+            for a in b:
+                if a.rect.colliderect(rect): out.append(a)
+        return out
+
+    def nearest(self, x, y, k=1, max_r=None):
+        """가까운 순 k개. 버킷 링을 넓혀 가며 찾고 링 밖이 더 멀 때 멈춤"""
+        if not self.buckets: return []
+        c = self.cell
+        kx0, ky0 = int(x) // c, int(y) // c
+        ks = self.buckets.keys()
+        reach = max(max(abs(kx-kx0), abs(ky-ky0)) for kx, ky in ks)
+        if max_r is not None: reach = min(reach, int(max_r) // c + 1)
+        found = []
+        for ring in range(reach + 1):
+            for ky in range(ky0-ring, ky0+ring+1):
+                for kx in range(kx0-ring, kx0+ring+1):
+                    if max(abs(kx-kx0), abs(ky-ky0)) != ring: continue
+                    for a in self.buckets.get((kx, ky), ()):
+                        ax, ay = a.center()
+                        d = math.hypot(ax-x, ay-y)
+                        if max_r is None or d <= max_r: found.append((d, id(a), a))
+            # 링 ring 바깥 버킷은 최소 ring*c 이상 떨어져 있음
+            if len(found) >= k and sorted(found)[k-1][0] <= ring*c: break
+        found.sort()
+        return [a for _, _, a in found[:k]]
@@ -1,11 +1,11 @@
 import random
 
-W, H = 24, 18
+W, H = 24, 18   # 기본 크기. 룸 배치는 이 크기 기준 좌표를 비율로 늘림
 
-def _empty_map():
-    m = [["#" for _ in range(W)] for _ in range(H)]
-    for y in range(1, H-1):
-        for x in range(1, W-1):
+def _empty_map(w=W, h=H):
+    m = [["#" for _ in range(w)] for _ in range(h)]
+    for y in range(1, h-1):
+        for x in range(1, w-1):
             m[y][x] = "."
     return m
 
@@ -16,22 +16,29 @@ def _rect(m, x0,y0,x1,y1, ch="."):
 
 def _place(m, x, y, ch): m[y][x] = ch
 
-def gen_room_graph(seed=None):
+def gen_room_graph(seed=None, w=W, h=H, rng=None):
     """
     4개 룸 (2x2) + 복도. 한 경로는 잠긴 문(D)로 막고, 다른 방에 열쇠(K) 배치. 
     중앙에 아레나(A/T), 좌하단 시작(@), 우상단 골(G), 좌상단 상점(S).
+    w, h: 맵 크기(타일). 기본(24x18)보다 크면 룸 좌표와 적/아이템 수를 비율대로 늘림
+    rng: random.Random 스트림. 없으면 seed로 새로 만듦 (전역 random 상태는 건드리지 않음)
     """
-    if seed is not None: random.seed(seed)
-    m = _empty_map()
+    if rng is None: rng = random.Random(seed)
+    w, h = max(w, W), max(h, H)
+    sx, sy = w / W, h / H
+    m = _empty_map(w, h)
 
-    #룸 영역
-    rooms = {
+    #룸 영역 (기본 크기 좌표 -> 비율 변환)
+    base_rooms = {
         "SW": (2, 8, 10, 15),
         "SE": (13, 8, 21, 15),
         "NW": (2, 2, 10, 7),
         "NE": (13, 2, 21, 7),
         "CTR": (9, 7, 14, 10),
     }
+    rooms = {k: (round(x0*sx), round(y0*sy), round(x1*sx), round(y1*sy))
+             for k, (x0, y0, x1, y1) in base_rooms.items()}
+    many = max(1, round(sx*sy))     # 넓이 비율만큼 배치 수 증가
     for (x0,y0,x1,y1) in rooms.values():
         _rect(m, x0, y0, x1, y1, '.')
     
@@ -58,16 +65,17 @@ def gen_room_graph(seed=None):
     _place(m, rooms["NW"][0]+2, rooms["NW"][1]+2, 'K')  #키
     _place(m, rooms["NW"][0]+3, rooms["NW"][1]+3, 'S')  #상점
     #적/코인/포션/샘플
-    for _ in range(3): _place(m, random.randint(rooms["SE"][0]+1, rooms["SE"][2]-1), random.randint(rooms["SE"][1]+1, rooms["SE"][3]-1), 'E')
-    for _ in range(2): _place(m, random.randint(rooms["NW"][0]+1, rooms["NW"][2]-1), random.randint(rooms["NW"][1]+1, rooms["NW"][3]-1), 'e')
-    for _ in range(3): _place(m, random.randint(2, W-3), random.randict(2, H-3), 'C')
-    for _ in range(2): _place(m, random.randint(2, W-3), random.randint(2, H-3), 'P')
+    for _ in range(3*many): _place(m, rng.randint(rooms["SE"][0]+1, rooms["SE"][2]-1), rng.randint(rooms["SE"][1]+1, rooms["SE"][3]-1), 'E')
+    for _ in range(2*many): _place(m, rng.randint(rooms["NW"][0]+1, rooms["NW"][2]-1), rng.randint(rooms["NW"][1]+1, rooms["NW"][3]-1), 'e')
+    for _ in range(3*many): _place(m, rng.randint(2, w-3), rng.randint(2, h-3), 'C')
+    for _ in range(2*many): _place(m, rng.randint(2, w-3), rng.randint(2, h-3), 'P')
 
     return ["".join(row) for row in m]
 
-def generate_level_set(n=3, seed=None):
+def generate_level_set(n=3, seed=None, size=(W, H), rng=None):
+    """rng를 주면 층마다 그 스트림을 이어 씀. 아니면 층마다 seed+i로 새 스트림"""
     out = []
     for i in range(n):
-        mp = gen_room_graph(seed=(None if seed is None else seed+1))
+        mp = gen_room_graph(seed=(None if seed is None else seed+i), w=size[0], h=size[1], rng=rng)
         out.append({"map":mp, "elite_rate":0.2 + 0.05*i})
     return out
\ No newline at end of file
@@ -1,20 +1,40 @@
 import math
+import os
 import random
 import sys
 import json
-from collections import deque
 from pathlib import Path
+from functools import lru_cache
 import pygame
 
 #-- 새로 붙인 모듈들 --
-from engine.projectiles import Projectiles as Bullet, LaserBeam as Laser
+from engine.projectiles import BulletPool, LaserBeam as Laser, laser_hits
 from engine.effects import add_or_stack_poison, serialize_effects, restore_effects, PoisonEffect
 from engine.schema import load_levels_v1_or_fallback, load_drops_v1_or_default, merge_options
 from engine.events import EventBus
 from engine.actions import Weapon
 from engine.content import load_weapons, load_relics
-
+from engine.navigation import FlowField
+from engine.grid import OccupancyGrid, WALL, DOOR, ARENA
+from engine.collision import move_rect
+from engine.spatial import SpatialHash
+from engine.los import LineOfSight
+from engine.hpa import HPAGraph
+from engine.pathfinding import find_path
+from engine.pathservice import PathService
+from engine.sim import SimInput, SimEvent
+from engine.rng import RngRegistry
+
+from render.tiles import TileLayer
+from render.fow import FogOfWar
+from render.minimap import Minimap
+from render.text import TextCache, CachedLine
+from render.dirty import DirtyRects
+from render.batch import SpriteBank
+from render.camera import Camera
+from render.null import NullRenderer
 from ai.fsm import RangedFSM, RangedConfig
+from ai.cover import CoverField
 from ai.bt import BossBT
 from spawner.director import Director
 from generators.mapgen import generate_level_set
@@ -27,6 +47,21 @@ WIDTH, HEIGHT = 24, 28
 TILE = 32
 SCREEN_W, SCREEN_H = WIDTH*TILE, HEIGHT*TILE
 FPS = 60
+SIM_HZ = 120        # 고정 시뮬레이션 스텝 (렌더 FPS와 분리)
+SIM_DT = 1.0 / SIM_HZ
+MAX_SIM_STEPS = 5   # 한 프레임에 따라잡는 최대 스텝 (느린 프레임 뒤 폭주 방지)
+
+# 독 파라미터(스킬/무기 공통)
+POISON_CHANCE = 0.35
+POISON_ADD = 1.5
+POISON_TICK = 0.5
+POISON_DMG = 1
+MAPGEN_SIZE = (24, 18)  # 자동 생성 맵 크기(타일). 화면보다 크면 카메라가 따라감
+MINIMAP_MAX_W = 160
+FLOW_RADIUS = 16    # 흐름장 확산 거리(타일). 밖에 있는 적은 HPA* 개별 경로
+HPA_CLUSTER = 8
+DEFAULT_PATH_BACKEND = "hpa"    # 레벨 "path_backend" 로 덮어씀 (bfs/astar/jps/hpa)
+PATH_BUDGET_NODES = 1500        # 프레임당 경로 탐색 노드 예산
 
 SAVE_DIR = Path(".")
 DATA_DIR = Path("data")
@@ -48,6 +83,7 @@ DEFAULT_OPTIONS = {
     "difficulty": "Normal",
     "fov_radius": 180,
     "screenshake": True,
+    "dirty_rects": False,   # 부분 갱신 렌더러 (display.update(rects))
     "keymap": {
         "pause":    [pygame.K_ESCAPE],
         "up":   [pygame.K_w, pygame.K_UP],
@@ -169,8 +205,14 @@ def length(vx, vy): return math.hypot(vx, vy)
 def normalize(vx, vy):
     l = length(vx, vy)
     if l == 0: return 0, 0
-    return vx/1, vy/1
+    return vx/l, vy/l
 def rect_from_tile(tx, ty): return pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)
+@lru_cache(maxsize=8)
+def fov_offsets(radius, tile):
+    """타일 중심끼리 거리가 radius 이내인 (dx, dy) 오프셋 (FogOfWar 시야 원과 같은 기준)"""
+    n = int(radius // tile)
+    return tuple((dx, dy) for dy in range(-n, n+1) for dx in range(-n, n+1)
+                 if (dx*tile)**2 + (dy*tile)**2 <= radius*radius)
 
 def load_json_safe(path, default):
     try:
@@ -180,10 +222,14 @@ def load_json_safe(path, default):
         pass
     return default
 
-def choose_levels_data():
+def choose_levels_data(rng=None):
+    """
+    AUTO_MAPGEN이면 절차 생성 3층 세트. rng(RngRegistry)를 주면 런 시드의 "mapgen" 스트림으로 만들어
+    --seed/RPG_SEED가 같으면 같은 맵, 없으면 실행마다 다른 맵. rng 없이 부르면 고정 시드 1234
+    """
     if AUTO_MAPGEN:
-        #　철차 생성 3층 세트
-        return generate_level_set(n=3, seed=1234)
+        if rng is None: return generate_level_set(n=3, seed=1234, size=MAPGEN_SIZE)
+        return generate_level_set(n=3, size=MAPGEN_SIZE, rng=rng.stream("mapgen"))
     return load_levels_v1_or_fallback(LEVELS_JSON, LEVELS_FALLBACK)
 
 DEFAULT_DROPS = {
@@ -200,7 +246,7 @@ def key_name(k):
 
 ACTION_ORDER = ["pause", "up", "down", "left", "right", "attack", "dash", "shop", "skill1"]
 ACTION_LABEL = {
-    "pasue":"Pause", "up":"Move Up", "down":"Move Down", "left":"Move Left", 
+    "pause":"Pause", "up":"Move Up", "down":"Move Down", "left":"Move Left", 
     "right":"Move Right", "attack":"Attack", "dash":"Dash", "shop":"Shop", 
     "skill1":"Use Skill",
 }
@@ -214,6 +260,7 @@ class Player:
     def __init__(self,x, y):
         self.r = TILE//2 - 4
         self.rect = pygame.Rect(x, y, self.r*2, self.r*2)
+        self.sub = [0.0, 0.0]  # 서브픽셀 이동 잔여
         self.base_speed = 150.0
         self.speed = self.base_speed
         self.hp_max = 8
@@ -227,8 +274,8 @@ class Player:
         self.keys = 0
         self.coins = 0
         # --- 대시/ 스테미나 ---
-        self.stamin_max = 100.0
-        self.stamin = self.stamin_max
+        self.stamina_max = 100.0
+        self.stamina = self.stamina_max
         self.stamina_regen = 28.0
         self.dash_cost = 36.0
         self.dash_cd = 0.65
@@ -254,22 +301,12 @@ class Player:
         if self.i_frames > 0: self.i_frames -= dt
         if self.dash_cd_timer > 0: self.dash_cd_timer -= dt
         if not self.dashing:
-            self.stamin = clamp(self.stamina + self.stamina_regen*dt, 0, self.stamina_max)
+            self.stamina = clamp(self.stamina + self.stamina_regen*dt, 0, self.stamina_max)
 
-    def move(self, dx, dy, dt, colliders, slow=False, custom_speed=None):
+    def move(self, dx, dy, dt, grid, slow=False, custom_speed=None):
         spd = (custom_speed if custom_speed is not None else self.speed) * (0.6 if slow else 1.0)
         vx, vy = normalize(dx, dy)
-        mvx, mvy = vx*spd*dt, vy*spd*dt
-        self.rect.x += int(mvx)
-        for w in colliders:
-            if self.rect.colliderect(w):
-                self.rect.right = min(self.rect.right, w.left) if mvx>0 else self.rect.right
-                self.rect.left = max(self.rect.left, w.right) if mvx<0 else self.rect.left
-        self.rect.y += int(mvy)
-        for w in colliders:
-            if self.rect.colliderect(w):
-                self.rect.bottom = min(self.rect.bottom, w.top) if mvy>0 else self.rect.bottom
-                self.rect.top = max(self.rect.top, w.bottom) if mvy<0 else self.rect.top
+        move_rect(grid, self.rect, vx*spd*dt, vy*spd*dt, rem=self.sub)
     
     def start_dash(self, dirx, diry):
         if self.sashing or self.sash_xd_timer > 0: return False
@@ -287,10 +324,10 @@ class Player:
         self.i_frames = max(self.i_frames, self.dah_i_frames)
         return True
     
-    def update_dash(self, dt, colliders):
+    def update_dash(self, dt, grid):
         if not self.dashing: return
         spd = self.speed * self.dash_speed_mult
-        self.move(self.dash_dir[0], self.dash_dir[1], dt, colliders, slow=False, custom_speed=spd)
+        self.move(self.dash_dir[0], self.dash_dir[1], dt, grid, slow=False, custom_speed=spd)
         self.dash_tleft -= dt
         if self.dash_tleft <= 0:
             self.dashing = False
@@ -301,15 +338,18 @@ class Player:
         self.i_frames = self.i_frames_max
 
 class Enemy:
+    path_backend = None     # None이면 레벨 설정 사용
+
     def __init__(self, x, y, scale_hp=1.0, scale_dmg=1.0, elite=False, mods=None):
         self.rect = pygame.Rect(x, y, TILE-8, TILE-8)
+        self.sub = [0.0, 0.0]  # 서브픽셀 이동 잔여
         self.speed = 90.0
         self.hp = int(round(3*scale_hp))
         self.dir_timer = 0.0
         self.rv = (0, 0)
         self.attack_timer = 0.0
         self.dmg = max(1, int(round(1*scale_dmg)))
-        # BFS
+        # 흐름장 밖일 때만 쓰는 개별 경로(HPA*)
         self.path = []
         self.path_timer = 0.0
         self.path_cd = 0.4
@@ -321,6 +361,7 @@ class Enemy:
         self.dead_drop_done = False
         # effect
         self.effects = []
+        self.poisoned = False   # PoisonEffect가 붙을 때/끝날 때 갱신
 
     def alive(self): return self.hp>0
     def center(self): return self.rect.centerx, self.rect.centery
@@ -338,56 +379,56 @@ class Enemy:
             if m == "tanky": self.hp = int(self.hp*1.6)
             elif m == "haste": self.speed *= 1.25
 
-    def ai(self, player_pos, walls, dt, world=None):
+    def ai(self, player_pos, walls, dt, world):
         px, py = player_pos
         ex, ey = self.center()
         vx, vy = px-ex, py-ey
         dist = length(vx, vy)
         chase_radius = TILE*6.0
 
-        if world is not None and dist < chase_radius:
-            self.path_timer -= dt
-            if self.path_timer <= 0:
-                self.path_timer = self.path_cd
-                self.path = bfs_path(world, self.rect, world.player.rect)
-            dx, dy = 0.0, 0.0
-            if self.path:
-                tx, ty = self.path[0]
+        if dist < chase_radius:
+            # 공유 흐름장에서 다음 칸만 읽음 (적 수와 무관하게 O(1))
+            here = tile_of_rect(self.rect)
+            step = world.nav.next_tile(*here)
+            if step is None and world.nav.distance(*here) != 0:
+                # 흐름장 반경 밖: 쿨다운마다 경로 서비스에 요청 (캐시 히트면 바로, 아니면 다음 프레임)
+                self.path_timer -= dt
+                if self.path_timer <= 0:
+                    self.path_timer = self.path_cd
+                    res = world.paths.request(self, here, tile_of_rect(world.player.rect),
+                                              self.path_backend or world.path_backend)
+                    if res: self.path = list(res.path)
+                res = world.paths.take(self)
+                if res: self.path = list(res.path)
+                while self.path and self.path[0] == here: self.path.pop(0)
+                step = self.path[0] if self.path else None
+            else:
+                self.path = []
+            if step:
+                tx, ty = step
                 cx, cy = tx*TILE + TILE//2, ty*TILE + TILE//2
                 dx, dy = normalize(cx - ex, cy - ey)
-                if length(cx-ex, ey-ey) < 4: self.path.pop(0)
-            else: 
+            else:
                 dx, dy = normalize(vx, vy)
         else:
             wander_change = 1.2
             self.dir_timer -= dt
             if self.dir_timer<=0:
-                self.dir_timer = wander_change + random.random()*0.8
-                a = random.random()*math.tau
-                self.rv=(math.vos(a), math.sin(a))
+                rng = world.rng.stream("ai")
+                self.dir_timer = wander_change + rng.random()*0.8
+                a = rng.random()*math.tau
+                self.rv=(math.cos(a), math.sin(a))
             dx, dy = self.rv
 
-        # 엘리트 오라/재생
-        if self.elite and "aura" in self.mods:
-            if dist <= TILE*1.1:
-                world.player.hurt(1)
+        # 엘리트 재생 (오라는 main 루프의 근접 조회에서 처리)
         if self.elite and "regen" in self.mods:
             self.regen_timer += dt
             if self.regen_timer >= 1.2:
                 self.regen_timer = 0.0
                 self.hp += 1
             
-        mvx, mvy = dx*self.speed*dt, dy*self.speed*dt
-        self.rect.x += int(mvx)
-        for w in walls + (world.doors if world else[]) + ((world.arena_doors if (world and world.arena_acive) else [])):
-            if self.rect.colliderect(w):
-                self.rect.right = min(self.rect.right, w.left) if mvx>0 else self.rect.right
-                self.rect.left = max(self.rect.left, w.right) if mvx<0 else self.rect.left
-        self.rect.y += int(mvy)
-        for w in walls + (world.doors if world else []) + ((world.arena_doors if (world and world.arena_active) else [])):
-            if self.rect.colliderect(w):
-                self.rect.bottom = min(self.rect.bottom, w.top) if mvy>0 else self.rect.bottom
-                self.rect.top = max(self.rect.top, w.bottom) if mvy<0 else self.rect.top
+        # 벽 + 문 + 활성 아레나 도어
+        move_rect(world.grid, self.rect, dx*self.speed*dt, dy*self.speed*dt, rem=self.sub)
 
         if self.attack_timer>0: self.attack_timer -= dt
 
@@ -404,6 +445,7 @@ class Enemy:
 class RangedEnemy:
     def __init__(self, x, y, scale_hp=1.0, elite=False, mods=None):
         self.rect = pygame.Rect(x, y, TILE-10, TILE-10)
+        self.sub = [0.0, 0.0]  # 서브픽셀 이동 잔여
         self.speed = 70.0
         self.hp = max(1, int(round(2*scale_hp)))
         self.shoot_cd = 1.6
@@ -412,6 +454,7 @@ class RangedEnemy:
         self.dead_drop_done = False
         # effects
         self.effects = []
+        self.poisoned = False   # PoisonEffect가 붙을 때/끝날 때 갱신
         # FSM
         self.brain = RangedFSM(RangedConfig(shoot_cooldown=self.shoot_cd))
         self._world_ref = None
@@ -420,7 +463,7 @@ class RangedEnemy:
     def set_world(self, world): self._world_ref = world
     
     def add_effect(self, effect):
-        self.effect.append(effect); effect.on_apply(self)
+        self.effects.append(effect); effect.on_apply(self)
     def tick_effects(self, dt):
         kept = []
         for eff in self.effects:
@@ -442,17 +485,8 @@ class RangedEnemy:
         if not self._world_ref:
             return
         dx, dy, shoot = self.brain.update(self, world=self._world_ref, dt=dt)
-        mvx, mvy = dx*self.speed*dt, dy*self.speed*dt
-        self.rect.x += int(mvx)
-        for w in walls:
-            if self.rect.colliderect(w):
-                self.rect.right = min(self.rect.right, w.left) if mvx>0 else self.rect.right
-                self.rect.left = max(self.rect.left, w.right) if mvx<0 else self.rect.left
-        self.rect.y += int(mvx)
-        for w in walls:
-            if self.rect.colliderect(w):
-                self.rect.bottom = min(self.rect.bottom, w.top) if mvy>0 else self.rect.bottom
-                self.rect.top = max(self.rect.top, w.bottom) if mvy<0 else self.rect.top
+        # 벽만 충돌
+        move_rect(self._world_ref.grid, self.rect, dx*self.speed*dt, dy*self.speed*dt, mask=WALL, rem=self.sub)
 
         if shoot:
             px, py = player_pos
@@ -460,13 +494,14 @@ class RangedEnemy:
             vx, vy = (px-ex), (py-ey)
             l = (vx*vx+vy*vy) ** 0.5
             if l>0:
-                bvx, bvy = vx/1, vy/1
-                bullets.append(Bullet(ex, ey, bvx, bvy, speed=230, ttl=2.6, radius=4, dmg=1))
+                bvx, bvy = vx/l, vy/l
+                bullets.spawn(ex, ey, bvx, bvy, speed=230, ttl=2.6, radius=4, dmg=1)
 
 class Boss:
     """보스 이동 + BT(전조-> 공격-> 쿨다운)"""
     def __init__(self, x, y, scale=1.0):
         self.rect = pygame.Rect(x, y, TILE*2-8, TILE*2-8)
+        self.sub = [0.0, 0.0]  # 서브픽셀 이동 잔여
         self.center_offset = (self.rect.w//2, self.rect.h//2)
         self.hp = int(round(40*scale))
         self.speed = 60.0
@@ -482,87 +517,36 @@ class Boss:
         if dist < TILE*5: dx, dy = normalize(-vx, -vy)
         elif dist > TILE*7.5: dx, dy = normalize(vx, vy)
         else: dx, dy = 0, 0
-        mvx, mvy = dx*self.speed*dt, dy*self.speed*dt
-        self.rect.x += int(mvx)
-        for w in walls:
-            if self.rect.colliderect(w):
-                self.rect.right = min(self.rect.right, w.left) if mvx>0 else self.rect.right
-                self.rect.left = max(self.rect.left, w.right) if mvx<0 else self.rect.left
-        self.rect.y += int(mvy)
-        for w in walls:
-            if self.rect.colliderect(w):
-                self.rect.bottom = min(self.rect.bottom, w.top) if mvy>0 else self.rect.bottom
-                self.rect.top = max(self.rect.top, w.bottom) if mvy<0 else self.rect.top
+        move_rect(world.grid, self.rect, dx*self.speed*dt, dy*self.speed*dt, mask=WALL, rem=self.sub)
         #패턴은 BT가 처리
         self.bt.tick(self, world, dt)
 
 # =================
-# BFS
+# 길찾기
 # =================
 def tile_of_rect(rect):
     return rect.centerx // TILE, rect.centery // TILE
 
-def blocked_tile_self(world):
-    blocks = set()
-    def add_rects(rects):
-        for r in rects:
-            blocks.add((r.x//TILE, r.y//TILE))
-    add_rects(world.walls)
-    add_rects(world.doors)
-    if world.arena_active:
-        add_rects(world.arena_doors)
-    return blocks
-
-def bfs_path(world, from_rect, to_rect):
-    start = tile_of_rect(from_rect)
-    goal = tile_of_rect(to_rect)
-    W = len(world.level[0]); H = len(world.level)
-    blocked = blocked_tile_self(world)
-
-    if start == goal:
-        return []
-    
-    q = deque([start])
-    prev = {start: None}
-    while q:
-        x, y = q.poleft()
-        for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
-            nx, ny = x+dx, y+dy
-            if not (0 <= nx < W and 0 <= ny < H): continue
-            if (nx, ny) in blocked: continue
-            if (nx, ny) in prev: continue
-            prev[(nx,ny)] = (x,y)
-            if (nx,ny) == goal:
-                q.clear(); break
-            q.append((nx,ny))
-
-    if goal not in prev:
-        return [] # 경로 없음
-    
-    path_rev = []
-    cur = goal
-    while cur and cur != start:
-        path_rev.append(cur)
-        cur = prev[cur]
-    path_rev.reverse()
-    return path_rev
-
 # ================
 # world
 # ================
 class World:
-    def __init(self, levels_data, level_index=0, options=None, drops=None, wep_dict=None, relic_dict=None):
+    def __init__(self, levels_data, level_index=0, options=None, drops=None, wep_dict=None, relic_dict=None, rng=None):
         self.levels_data = levels_data
         self.level_index = level_index
         self.options = options or DEFAULT_OPTIONS.copy()
         self.drops = drops or DEFAULT_DROPS
         self.wep_dict = wep_dict or {}
         self.relic_dict = relic_dict or {}
+        self.director = None    # 웨이브 디렉터 (main이 붙임, step에서 갱신)
+        self.events = []        # 마지막 step에서 생긴 SimEvent
+        self.rng = rng or RngRegistry()  # 서브시스템별 난수 스트림 (elite/drops/ai/director/combat/fx)
         self.reset_from_raw(levels_data[level_index])
 
     def reset_from_raw(self, level_entry):
         level_raw = level_entry["map"]
         self.elite_rate = float(level_entry.get("elite_rate", 0.2))
+        self.path_backend = level_entry.get("path_backend", DEFAULT_PATH_BACKEND)
         diff = self.options["difficulty"]
         scale = DIFF_SCALE[diff]
         self.level = level_raw
@@ -570,10 +554,21 @@ class World:
         self.potions=[]; self.enemies=[]; self.ranged=[]
         self.keys=[]; self.coins=[]; self.doors=[]
         self.open_doors=[]; self.arena_doors=[]; self.triggers=[]
-        self.shops=[]; self.bullets=[]; self.lasers=[]
+        self.shops=[]; self.bullets=BulletPool(); self.lasers=[]
         self.player=None; self.boss=None
         self.arena_active=False
-        self.seen = set() # FOW 기억
+        self.seen = set() # FOW 기억 (step의 reveal이 채움, 렌더는 읽기만)
+        self._reveal_key = None
+        self.tile_layer = None  # 배경 캐시 (draw_world가 첫 프레임에 만듦)
+        self.fow = None         # 안개 마스크 (draw_world가 seen으로 만듦)
+        self.minimap = None     # 미니맵 캐시
+        self.camera = None      # 뷰포트 (맵이 화면보다 크면 플레이어를 따라감)
+        self.grid = OccupancyGrid.from_level(self.level, TILE)
+        self.nav = FlowField(self.grid.w, self.grid.h, max_dist=FLOW_RADIUS)
+        self.hpa = HPAGraph(self.grid, cluster=HPA_CLUSTER)
+        self.los = LineOfSight(self.grid)
+        self.cover = CoverField(self.grid)
+        self.paths = PathService(self.grid, self.hpa, budget_nodes=PATH_BUDGET_NODES)
         # 맵 피싱
         for ty, row in enumerate(self.level):
             for tx, ch in enumerate(row):
@@ -584,13 +579,13 @@ class World:
                 elif ch=='P': self.potions.append(r)
                 elif ch=='E':
                     ex, ey = tx*TILE+4, ty*TILE+4
-                    elite, mods = roll_elite(melee=True, rate=self.elite_rate)
+                    elite, mods = roll_elite(melee=True, rate=self.elite_rate, rng=self.rng.stream("elite"))
                     e = Enemy(ex, ey, scale_hp=scale["enemy_hp"], scale_dmg=scale["enemy_dmg"], elite=elite, mods=mods)
                     e.apply_mods()
                     self.enemies.append(e)
                 elif ch=='e':
                     ex, ey = tx*TILE+TILE//2, ty*TILE+TILE//2 # 기준 코드의 방식 유지(센터 기반)
-                    elite, mods = roll_elite(melee=False, rate=self.elite_rate)
+                    elite, mods = roll_elite(melee=False, rate=self.elite_rate, rng=self.rng.stream("elite"))
                     re = RangedEnemy(ex, ey, scale_hp=scale["enemy_hp"], elite=elite, mods=mods)
                     re.set_world(self)
                     self.ranged.append(re)
@@ -608,20 +603,210 @@ class World:
                     self.player = Player(px, py)
         if self.player is None:
             self.player = Player(TILE+4, TILE+4)
+        self.spatial = SpatialHash(cell=TILE*2)
+        self.rebuild_spatial()
         
-    def soloid_colliders(self):
-        return self.walls + self.doors + (self.arena_doors if self.arena_active else [])
-    
+    def rebuild_spatial(self):
+        """살아있는 근접/원거리 적 공간 해시 (프레임당 한 번)"""
+        self.spatial.clear()
+        for e in self.enemies:
+            if e.alive(): self.spatial.insert(e)
+        for e in self.ranged:
+            if e.alive(): self.spatial.insert(e)
+
+    def snapshot_positions(self):
+        """고정 스텝 직전 액터 위치 기억 (그리기 보간용, 탄은 BulletPool이 직접 보관)"""
+        for a in [self.player, *self.enemies, *self.ranged, *([self.boss] if self.boss else [])]:
+            a.prev_xy = (a.rect.x, a.rect.y)
+
+    def find_path(self, from_rect, to_rect, backend=None):
+        """PathResult(path, length, expanded). backend 미지정이면 레벨 설정"""
+        return find_path(self.grid, tile_of_rect(from_rect), tile_of_rect(to_rect),
+                         backend or self.path_backend, hpa=self.hpa)
+
+    def update_nav(self):
+        """플레이어 타일이나 막힘 상태가 바뀐 경우에만 흐름장 재계산"""
+        goal = tile_of_rect(self.player.rect)
+        if self.nav.stale(goal, self.grid.version):
+            self.nav.build(goal, self.grid.version, self.grid)
+
+    # ------ 점유 격자와 같이 바뀌는 상태 ------
+    def open_door(self, r):
+        self.doors.remove(r)
+        self.open_doors.append(r)
+        self.grid.open_door(r)
+
+    def set_arena_active(self, active):
+        self.arena_active = active
+        self.grid.set_arena(active)
+
+    def clear_arena_doors(self):
+        for r in self.arena_doors: self.open_doors.append(r)
+        self.arena_doors = []
+        self.grid.clear_arena()
+
     def tile_at(self, x, y, arr):
         pt = pygame.Rect(x, y, 1, 1)
         return any(r.colliderect(pt) for r in arr)
     
-    def nect_level(self):
+    def next_level(self):
         if self.level_index+1 >= len(self.levels_data): return False
         self.level_index += 1
         self.reset_from_raw(self.levels_data[self.level_index])
         return True
     
+    # ------ 시뮬레이션 스텝 ------
+    def _emit(self, name, **data):
+        self.events.append(SimEvent(name, data))
+
+    def reveal(self):
+        """시야 반경 안 타일을 seen에 기록. 플레이어 타일이나 반경이 바뀐 때만 (헤드리스/창 모드 같은 결과)"""
+        px, py = self.player.center()
+        ptx, pty = int(px)//TILE, int(py)//TILE
+        radius = self.options["fov_radius"]
+        key = (ptx, pty, radius)
+        if key == self._reveal_key: return
+        self._reveal_key = key
+        W, H = self.grid.w, self.grid.h
+        for dx, dy in fov_offsets(radius, TILE):
+            tx, ty = ptx+dx, pty+dy
+            if 0 <= tx < W and 0 <= ty < H: self.seen.add((tx, ty))
+
+    def step(self, inp: SimInput, dt):
+        """
+        입력 하나로 dt만큼 진행하고 이번 스텝에 생긴 SimEvent 목록 반환.
+        렌더/메타 진행/저장은 모르고, 필요한 건 이벤트로 알림
+        (shake, enemy_died, pickup, arena_clear, player_died, level_advanced, won)
+        """
+        self.events = []
+        player = self.player
+        self.snapshot_positions()
+        # 이동
+        dx, dy = inp.move
+        if dx or dy: player.last_dir = normalize(dx, dy)
+        on_water = self.tile_at(*player.center(), self.water)
+        if player.dashing: player.update_dash(dt, self.grid)
+        else: player.move(dx, dy, dt, self.grid, slow=on_water)
+        player.update_timers(dt)
+
+        # 공격 / 스킬1: 포이즌 노바
+        if inp.attack and player.can_attack():
+            player.attack()
+            hit = player.weapon.attack(
+                player, self,
+                poison_chance=POISON_CHANCE + player.poison_bonus,
+                poison_add=POISON_ADD, poison_tick=POISON_TICK, poison_dmg=POISON_DMG
+            ) if player.weapon else False
+            if hit: self._emit("shake", amount=0.18)
+        if inp.skill1:
+            px, py = player.center()
+            any_hit = False
+            for e in self.spatial.query_radius(px, py, 80):
+                if e.alive():
+                    add_or_stack_poison(e, base_duration=1.5, dmg_per_tick=POISON_DMG, tick=POISON_TICK, cap_duration=6.0)
+                    any_hit = True
+            if any_hit: self._emit("shake", amount=0.2)
+
+        # Arena Trigger
+        if not self.arena_active and any(t.colliderect(player.rect) for t in self.triggers):
+            self.set_arena_active(True)
+
+        # 흐름장/경로 예산/시야 캐시 + 탐험 기록
+        self.update_nav(); self.paths.update(); self.los.begin_frame()
+        self.reveal()
+
+        #  적 AI + 상태 이상 틱 + 사망 드랍
+        for e in self.enemies:
+            if e.alive():
+                e.ai(player.center(), self.walls, dt, self)
+                e.tick_effects(dt)
+            elif not e.dead_drop_done:
+                e.dead_drop_done = True
+                self.maybe_drop("enemy", e.center(), elite=e.elite)
+                self._emit("enemy_died", kind="enemy", pos=e.center(), elite=e.elite)
+        for e in self.ranged:
+            if e.alive():
+                e.ai(player.center(), self.walls, dt, self.bullets)
+                e.tick_effects(dt)
+            elif not e.dead_drop_done:
+                e.dead_drop_done = True
+                self.maybe_drop("ranged", e.center(), elite=e.elite)
+                self._emit("enemy_died", kind="ranged", pos=e.center(), elite=e.elite)
+
+        # 이동이 끝난 위치로 공간 해시 갱신 후 플레이어 주변만 근접 공격/오라 판정
+        self.rebuild_spatial()
+        px, py = player.center()
+        for e in self.spatial.query_radius(px, py, TILE*1.1):
+            if not isinstance(e, Enemy) or not e.alive(): continue
+            if e.elite and "aura" in e.mods: player.hurt(1)
+            if e.try_attack(player): self._emit("shake", amount=0.22)
+
+        if self.boss and self.boss.alive():
+            self.boss.ai(player.center(), self.walls, dt, self.bullets, self.lasers, self)
+        elif self.boss and not getattr(self.boss, "_drop_done", False):
+            self.boss._drop_done = True
+            self.maybe_drop("boss", self.boss.center(), elite=True)
+            self._emit("enemy_died", kind="boss", pos=self.boss.center(), elite=True)
+
+        # 탄환
+        for dmg in self.bullets.update(dt, self.grid, player.center(), player.rect):
+            player.hurt(dmg); self._emit("shake", amount=0.2)
+
+        # 레이저
+        for lz in self.lasers:
+            lz.update(dt, self.grid)
+        if laser_hits(self.lasers, [player.center()], [player.r])[0]:
+            player.hurt(2)
+        self.lasers = [lz for lz in self.lasers if not lz.done]
+
+        # 상호작용: 포션 / 열쇠 / 코인 / 문
+        if not inp.shop_open:
+            take=[]
+            for r in self.potions:
+                if r.colliderect(player.rect): take.append(r); player.hp = clamp(player.hp+2, 0, player.hp_max)
+            for r in take: self.potions.remove(r)
+            take=[]
+            for r in self.keys:
+                if r.colliderect(player.rect): take.append(r); player.keys += 1
+            for r in take: self.keys.remove(r)
+            take=[]
+            for r in self.coins:
+                if r.colliderect(player.rect):
+                    take.append(r); player.coins += 1
+                    self._emit("pickup", item="coin", pos=r.center)
+            for r in take: self.coins.remove(r)
+
+            # 문 열기
+            for r in [r for r in self.doors if r.colliderect(player.rect)]:
+                if player.keys>0:
+                    player.keys-=1; self.open_door(r); player.rect.y -= 2
+
+        # 아레나 클리어 체크
+        if self.arena_active:
+            alive_count = (sum(1 for e in self.enemies if e.alive()) +
+                           sum(1 for e in self.ranged if e.alive()) +
+                           (1 if (self.boss and self.boss.alive()) else 0))
+            if alive_count==0:
+                self.set_arena_active(False)
+                self.clear_arena_doors()
+                self._emit("arena_clear", level=self.level_index)
+
+        # 디랙터(뤠이브 자동화)
+        if self.director: self.director.update(dt)
+
+        # 승리/사망/스테이지 전화
+        if player.hp<=0: self._emit("player_died")
+        if self.goal and player.rect.colliderect(self.goal):
+            if not self.next_level(): self._emit("won")
+            else:
+                player = self.player
+                if not player.weapon and "Rusty Sword" in self.wep_dict:
+                    player.weapon = Weapon("Rusty Sword", self.wep_dict["Rusty Sword"])
+                    player.weapon.on_equip(player)
+                apply_relics_to_player(player, self.relic_dict)
+                self._emit("level_advanced", level=self.level_index)
+        return self.events
+
     # ------ 드랍 헬퍼 ------
     def maybe_drop(self, kind, pos, elite=False):
         elite_mult = 1.3 if elite else 1.0
@@ -630,10 +815,11 @@ class World:
         def place_rect(lst, inflate):
             r = rect_from_tile(int(tx), int(ty)).inflate(*inflate)
             lst.append(r)
+        rng = self.rng.stream("drops")
         for item, table in self.drops.items():
             p = float(table.get(kind, 0.0)) * elite_mult
-            if random.random() < min(0.95, p):
-                if item == "coin": place_rect(self.coinds, (-20,-20))
+            if rng.random() < min(0.95, p):
+                if item == "coin": place_rect(self.coins, (-20,-20))
                 elif item == "potion": place_rect(self.potions, (-10,-10))
                 elif item == "key": place_rect(self.keys, (-12,-12))
 
@@ -643,6 +829,7 @@ class World:
         data = {
             "schema": 2,
             "level_index": self.level_index,
+            "run_seed": self.rng.seed,
             "player": {"x": self.player.rect.x, "y": self.player.rect.y,
                        "hp": self.player.hp, "keys": self.player.keys, "coins": self.player.coins,
                        "speed": self.player.speed, "cool": self.player.attack_cool, "hp_max": self.player.hp_max,
@@ -704,35 +891,41 @@ class World:
         self.open_doors = tiles_to_rects(data.get("open_doors", []))
         self.arena_doors = tiles_to_rects(data.get("arena_doors"))
         self.arena_active = data.get("arena_active", False)
+        self.grid.set_rects(DOOR, self.doors)
+        self.grid.set_rects(ARENA, self.arena_doors)
+        self.grid.set_arena(self.arena_active)
         # enemy/boss
         self.enemies = [Enemy(e["x"], e["y"], elite=e.get("elite", False), mods=e.get("mods", [])) for e in data.get("enemies", [])]
         for ent, d in zip(self.enemies, data.get("enemies", [])):
             ent.hp = d.get("hp", ent.hp)
             ent.effects = restore_effects(d.get("effects"))
+            ent.poisoned = any(isinstance(eff, PoisonEffect) for eff in ent.effects)
             ent.apply_mods()
         self.ranged = [RangedEnemy(r["x"], r["y"], elite=r.get("elite", False), mods=r.get("mods", [])) for r in data.get("ranged", [])]
         for ent, d in zip(self.ranged, data.get("ranged", [])):
             ent.hp = d.get("hp", ent.hp)
             ent.effects = restore_effects(d.get("effects"))
+            ent.poisoned = any(isinstance(eff, PoisonEffect) for eff in ent.effects)
             ent.set_world(self)
         b = data.get("boos")
         if b:
             self.boss = Boss(b["x"], b["y"])
             self.boss.hp = b.get("hp", self.boss.hp)
         self.seen = set(tuple(x) for x in data.get("seen", []))
+        self.rebuild_spatial()
         
 #------------
 # elite roll
 #------------
 MELEE_MOD_POOL = ["tanky", "haste", "regen", "aura"]
 RANGED_MOD_POOL = ["tanky", "haste", "rapid", "multishot"]
-def roll_elite(melee: bool, rate: float):
-    elite = (random.random() < rate)
+def roll_elite(melee: bool, rate: float, rng=random):
+    elite = (rng.random() < rate)
     mods = []
     if elite:
         pool = MELEE_MOD_POOL if melee else RANGED_MOD_POOL
-        n = 1 + (random.random() < 0.35) # 35% 확률로 2개
-        mods = random.sample(pool, k=n)
+        n = 1 + (rng.random() < 0.35) # 35% 확률로 2개
+        mods = rng.sample(pool, k=n)
     return elite, mods
 
 #=================
@@ -786,117 +979,150 @@ def apply_relics_to_player(player: Player, relic_dict: dict):
 # =================
 # 랜더링
 # =================
-def has_poison(ent):
-    for eff in getattr(ent, "effects", []):
-        if isinstance(eff, PoisonEffect): return True
-        if getattr(eff, "id", "") == "poison": return True
-    return False
-
-def draw_world(screen, world: World, font, shake,fow_surface, options, shop_ui: ShopState):
-    #background tile
-    screen.fill(COLORS["bg"])
-    for ty, row in enumerate(world.level):
-        for tx, ch in enumerate(row):
-            rect = rect_from_tile(tx, ty)
-            if ch=='#': pygame.draw.rect(screen, COLORS["wall"], rect)
-            elif ch=='~': pygame.draw.rect(screen, COLORS["water"], rect)
-            elif ch=='G': pygame.draw.rect(screen, COLORS["goal"], rect)
-            else: pygame.draw.rect(screen, COLORS["floor"], rect)
-    # door/ arena_door/ shop
-    for r in world.doors: pygame.draw.rect(screen, COLORS["door"], r)
-    for r in world.arena_doors: pygame.draw.rect(screen, COLORS["arena"], r)
-    for r in world.open_doors: pygame.draw.rect(screen, (180, 140, 90), r.inflate(-8,-8))
-    for r in world.shops: pygame.draw.rect(screen, COLORS["shop"], r.inflate(-6,-6))
-    # item
-    for r in world.coins: pygame.draw.circle(screen, COLORS["coin"], r.center, 6)
-    for r in world.keys: pygame.draw.rect(screen, COLORS["eky"], r.inflate(-12,-12))
-    for r in world.potions: pygame.draw.rect(screen, COLORS["potions"], r.inflate(-10, -10))
-    # enemy/ boss
+
+# 글자 렌더 캐시 / 값이 바뀔 때만 다시 만드는 HUD 줄 / 액터·탄 표면
+TEXT = TextCache()
+SPRITES = SpriteBank(COLORS)
+HUD_LINE = CachedLine(lambda hp, hp_max, potions, keys, coins, enemies, stage, stages, weapon:
+                      f"HP {hp}/{hp_max} Potions {potions} Keys {keys}"
+                      f"Coins {coins} Enemies {enemies} Stage {stage}/{stages} Weapon {weapon}")
+KEYMAP_LINE = CachedLine(lambda keymap: "keymap: " + ", ".join(
+    f"{ACTION_LABEL[a]}={ '/'.join(key_name(k) for k in ks) }" for a, ks in zip(ACTION_ORDER, keymap)))
+
+def lerp_rect(a, alpha):
+    """직전 스텝 위치와 현재 위치 사이를 alpha로 보간한 사각형 (고정 스텝 렌더용)"""
+    prev = getattr(a, "prev_xy", None)
+    if prev is None or alpha >= 1.0: return a.rect
+    x = round(prev[0] + (a.rect.x - prev[0]) * alpha)
+    y = round(prev[1] + (a.rect.y - prev[1]) * alpha)
+    return pygame.Rect(x, y, a.rect.w, a.rect.h)
+
+def moving_rects(world: World, alpha=1.0):
+    """부분 갱신용: 매 프레임 다시 그리는 것들의 월드 사각형 (아이템도 안개 밑에 다시 깔려야 함)"""
+    out = list(world.coins) + list(world.keys) + list(world.potions)
+    for e in world.enemies:
+        if e.alive(): out.append(lerp_rect(e, alpha).inflate(8,8))
+    for e in world.ranged:
+        if e.alive(): out.append(lerp_rect(e, alpha).inflate(8,8))
+    if world.boss and world.boss.alive(): out.append(lerp_rect(world.boss, alpha).inflate(4,4))
+    for bx, by, br in world.bullets.draw_list(alpha):
+        out.append(pygame.Rect(bx-br-1, by-br-1, 2*br+2, 2*br+2))
+    for lz in world.lasers:
+        if lz.done: continue
+        ex, ey = lz.end if lz.end else (lz.x, lz.y)
+        pad = lz.width + 4
+        out.append(pygame.Rect(min(lz.x, ex)-pad, min(lz.y, ey)-pad, abs(ex-lz.x)+2*pad, abs(ey-lz.y)+2*pad))
+    px, py = lerp_rect(world.player, alpha).center
+    r = world.player.r + 3
+    out.append(pygame.Rect(px-r, py-r, 2*r, 2*r))
+    return out
+
+def draw_world(screen, world: World, font, shake, options, shop_ui: ShopState, dirty=None, alpha=1.0):
+    """alpha: 고정 스텝 누적 잔여 비율. 액터/탄을 직전 스텝 위치와 보간해서 그림"""
+    if world.tile_layer is None:
+        world.tile_layer = TileLayer(world.level, TILE, COLORS)
+    if world.fow is None:
+        world.fow = FogOfWar(world.grid.w, world.grid.h, TILE, world.seen)
+    if world.camera is None:
+        world.camera = Camera(SCREEN_W, SCREEN_H, world.grid.w*TILE, world.grid.h*TILE)
+    cam = world.camera
+    player_draw = lerp_rect(world.player, alpha)
+    cam.follow(*player_draw.center)
+    ox, oy = cam.offset
+    world.tile_layer.sync(world.doors, world.arena_doors, world.open_doors, world.shops)
+    world.fow.update(*world.player.center(), options["fov_radius"])  # 그리기용 시야만 (seen은 step이 기록)
+    # 부분 갱신: 장면 키(카메라 위치 포함)가 그대로고 흔들림이 없으면 움직인 영역만 배경/안개 복원
+    areas = None
+    if dirty is not None:
+        key = (world.tile_layer, world.tile_layer.key, world.fow.key, cam.offset,
+               len(world.coins), len(world.keys), len(world.potions), shop_ui.open)
+        full = dirty.begin(key, force=(shake > 0 and options["screenshake"]) or shop_ui.open)
+        for r in moving_rects(world, alpha): dirty.add(cam.apply(r))
+        if not full: areas = dirty.restore_areas()
+    #background tile (정적 레이어 캐시) + door/ arena_door/ shop 오버레이
+    if areas is None:
+        screen.fill(COLORS["bg"])
+        world.tile_layer.draw(screen, world, cam.offset)
+    else:
+        for r in areas:
+            screen.fill(COLORS["bg"], r)
+            world.tile_layer.draw_area(screen, r, cam.offset)
+    # item (화면 밖은 건너뜀)
+    for r in world.coins:
+        if cam.visible(r): pygame.draw.circle(screen, COLORS["coin"], cam.to_screen(*r.center), 6)
+    for r in world.keys:
+        if cam.visible(r): pygame.draw.rect(screen, COLORS["key"], cam.apply(r.inflate(-12,-12)))
+    for r in world.potions:
+        if cam.visible(r): pygame.draw.rect(screen, COLORS["potion"], cam.apply(r.inflate(-10, -10)))
+    # enemy/ boss (미리 구운 표면을 레이어당 blits 한 번)
+    actors = []
     for e in world.enemies:
-        if e.alive():
-            pygame.draw.rect(screen, COLORS["eney"], e.rect)
-            if e.elite:
-                pygame.draw.rect(screen, COLORS["elite"], e.rect.inflate(6,6), 2)
-            if has_poison(e):
-                pygame.draw.rect(screen, COLORS["poison_glow"], e.rect.inflate(4,4), 2)
+        if not e.alive(): continue
+        r = lerp_rect(e, alpha)
+        if cam.visible(r): actors.append(SPRITES.actor_blit("enemy", e.elite, e.poisoned, cam.apply(r)))
     for e in world.ranged:
-        if e.alive():
-            pygame.draw.rect(screen, COLORS["ranged"], e.rect)
-            if e.elite:
-                pygame.draw.rect(screen, COLORS["elite"], e.rect.inflate(6,6), 2)
-            if has_poison(e):
-                pygame.draw.rect(screen, COLORS["poison_glow"], e.rect.inflate(4,4), 2)
+        if not e.alive(): continue
+        r = lerp_rect(e, alpha)
+        if cam.visible(r): actors.append(SPRITES.actor_blit("ranged", e.elite, e.poisoned, cam.apply(r)))
+    if world.boss and world.boss.alive():
+        r = lerp_rect(world.boss, alpha)
+        if cam.visible(r): actors.append(SPRITES.actor_blit("boss", False, False, cam.apply(r)))
+    screen.blits(actors, doreturn=False)
     if world.boss and world.boss.alive():
-        pygame.draw.rect(screen, COLORS["boss"], world.boss.rect, border_radius=4)
         bw = clamp(int((world.boss.hp/40.0)*200), 0, 200)
         pygame.draw.rect(screen, (30, 30, 30), (SCREEN_W//2-100, 8, 200, 8))
         pygame.draw.rect(screen, (230,70,70), (SCREEN_W//2-100, 8, bw, 8))
     #탄환
-    for b in world.bullets:
-        if b.alive: pygame.draw.circle(screen, COLORS["bullets"], (int(b.x), int(b.y)), b.radius)
+    screen.blits([(SPRITES.bullet(br, COLORS["bullet"]), (bx-br-ox, by-br-oy))
+                  for bx, by, br in world.bullets.draw_list(alpha) if cam.visible_point(bx, by, br)],
+                 doreturn=False)
     #레이저
     for lz in world.lasers:
-        lz.draw(screen)
+        if cam.visible(lz.bounds()): lz.draw(screen, cam.offset)
     # player
-    px, py = world.player.center()
+    px, py = cam.to_screen(*player_draw.center)
     color = COLORS["player"]
     if world.player.i_frames>0 and int(pygame.time.get_ticks()/60)%2==0:
         color = COLORS["hurt"]
-    sx, sy = (random.randint(-2,2), random.randint(-2,2)) if (shake>0 and options["screenshake"]) else (0,0)
+    fx = world.rng.stream("fx")  # 렌더링 전용 스트림: 프레임 수가 달라도 시뮬레이션 난수에 영향 없음
+    sx, sy = (fx.randint(-2,2), fx.randint(-2,2)) if (shake>0 and options["screenshake"]) else (0,0)
     pygame.draw.circle(screen, color, (px+sx, py+sy), world.player.r)
     # ------- Fog-of-War ------
-    fov_r = options["fov_radius"]
-    visible = set()
-    pxc, pyc = world.player.center()
-    fow_surface.fill((0,0,0,0))
-    for ty, row in enumerate(world.level):
-        for tx, ch in enumerate(row):
-            cx, cy = tx*TILE + TILE//2, ty*TILE + TILE//2
-            if length(pxc-cx, pyc-cy) <= fov_r:
-                visible.add((tx, ty))
-    world.seen.update(visible)
-    for ty, row in enumerate(world.level):
-        for tx, ch in enumerate(row):
-            r = rect_from_tile(tx, ty)
-            if (tx,ty) not in world.seen:
-                s = pygame.Surface((r.w, r.h), pygame.SRCALPHA); s.fill((0,0,0,220)); fow_surface.blt(s, r.topleft)
-            elif (tx, ty) not in visible:
-                s = pygame.Surface((r.w, r.h), pygame.SRCALPHA); s.fill((0,0,0,120)); fow_surface.blit(s, r.topleft)
-    screen.blit(fow_surface, (0,0))
+    if areas is None:
+        world.fow.draw(screen, cam.offset)
+    else:
+        for r in areas: world.fow.draw_area(screen, r, cam.offset)
     # HUD
     hud_rect = pygame.Rect(0, 0, SCREEN_W, 44)
     pygame.draw.rect(screen, COLORS["hud_back"], hud_rect)
     enemies_left = sum(1 for e in world.enemies if e.alive()) + sum(1 for e in world.ranged if e.alive()) + (1 if (world.boss and world.boss.alive()) else 0)
     weapon_name = world.player.weapon.name if world.player.weapon else "None"
-    line1 = (f"HP {world.player.hp}/{world.player.hp_max} Potions {len(world.potions)} Keys {world.player.keys}"
-             f"Coins {world.player.coins} Enemies {enemies_left} Stage {world.level_index+1}/{len(world.levels_data)} Weapon {weapon_name}")
-    screen.blit(font.render(line1, True, COLORS["hud_text"]), (8, 4))
+    line1 = HUD_LINE.get(world.player.hp, world.player.hp_max, len(world.potions), world.player.keys, world.player.coins,
+                         enemies_left, world.level_index+1, len(world.levels_data), weapon_name)
+    screen.blit(TEXT.render(font, line1, COLORS["hud_text"]), (8, 4))
     # stanima bar
     bar_x, bar_y, bar_w, bar_h = 8, 24, 180, 10
     pygame.draw.rect(screen, (30,30,30), (bar_x-1, bar_y-1, bar_w+2, bar_h+2))
     ration = world.player.stamina / world.player.stamina_max
     pygame.draw.rect(screen, (90,160,90), (bar_x, bar_y, int(bar_w*ration), bar_h))
     cd = max(0.0, world.player.dash_cd_timer)
-    screen.blit(font.rengder(f"DashCD {cd:.1f}s", True, (230,230,230)), (bar_x + bar_w + 8, bar_y-2))
-    draw_minimap(screen, world)
+    screen.blit(TEXT.render(font, f"DashCD {cd:.1f}s", (230,230,230)), (bar_x + bar_w + 8, bar_y-2))
+    mm_rect = draw_minimap(screen, world)
+    if dirty is not None:
+        dirty.add(hud_rect); dirty.add(mm_rect)
     if shop_ui.open:
         draw_shop(screen, font, shop_ui)
 
 def draw_minimap(screen, world: World):
     margin = 8
-    scale = 0.2
-    mw, mh = int(SCREEN_W*scale), int(SCREEN_H*scale)
-    x0, y0 = SCREEN_W - mw - margin + 48
-    pygame.draw.rect(screen, (0,0,0), (x0-2, y0-2, mw+4, mh+4))
-    pygame.draw.rect(screen, (18,18,22), (x0, y0, mw, mh))
-    for ty, row in enumerate(world.level):
-        for tx, ch in enumerate(row):
-            rect = pygame.Rect(x0 + int(tx*TILE*scale), y0 + int(ty*TILE*scale), int(TILE*scale), int(TILE*scale))
-            if ch=='#': pygame.draw.rect(screen, (70,70,90), rect)
-            elif ch=='G': pygame.draw.rect(screen, (30120,40), rect)
-            elif ch=='S': pygame.draw.rect(screen, (100,180,100), rect)
-    px,py = world.player.center()
-    pygame.draw.circle(screen, (250,250,90), (x0+int(px*scale), y0+int(py*scale)), max(2, int(world.player.r*scale)))
+    if world.minimap is None:
+        # 큰 맵도 화면 구석에 들어가게 가로 MINIMAP_MAX_W 픽셀로 제한
+        scale = min(0.2, MINIMAP_MAX_W / (world.grid.w*TILE))
+        world.minimap = Minimap(world.level, TILE, scale, COLORS)
+    x0 = SCREEN_W - world.minimap.surface.get_width() - margin
+    y0 = 44 + margin
+    return world.minimap.draw(screen, world, x0, y0, world.options["fov_radius"],
+                              world.camera.rect if world.camera else None)
 
 def draw_center_message(screen, font_big, lines):
     shadow = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
@@ -904,7 +1130,7 @@ def draw_center_message(screen, font_big, lines):
     screen.blit(shadow, (0,0))
     y = SCREEN_H//2 - len(lines)*18
     for ln in lines:
-        sf = font_big.render(ln, True, (240,240,240))
+        sf = TEXT.render(font_big, ln, (240,240,240))
         screen.blit(sf, (SCREEN_W//2 - sf.get_width()//2, y))
         y += sf.get_height() + 6
     
@@ -921,33 +1147,89 @@ def draw_shop(screen, font, shop: ShopState):
     ]
     yy = y+12
     for ln in lines:
-        screen.blit(font.render(ln, True, (230,230,230)), (x+12, yy))
+        screen.blit(TEXT.render(font, ln, (230,230,230)), (x+12, yy))
         yy += 26
 
+class PygameRenderer:
+    """창에 그리는 기본 렌더러. 헤드리스면 render.null.NullRenderer가 같은 자리를 대신함"""
+    headless = False
+
+    def __init__(self, screen, font, font_big, dirty=None):
+        self.screen = screen
+        self.font = font
+        self.font_big = font_big
+        self.dirty = dirty
+
+    def draw_world(self, world, shake, options, shop_ui, alpha=1.0):
+        draw_world(self.screen, world, self.font, shake, options, shop_ui, self.dirty, alpha)
+
+    def draw_center_message(self, lines):
+        draw_center_message(self.screen, self.font_big, lines)
+        self.invalidate()
+
+    def draw_tip(self, text):
+        sf = TEXT.render(self.font, text, (240,240,240))
+        self.screen.blit(sf, (8,48))
+        if self.dirty: self.dirty.add(sf.get_rect(topleft=(8,48)))
+
+    def invalidate(self):
+        """다음 프레임은 전체 갱신 (부분 갱신 모드일 때)"""
+        if self.dirty: self.dirty.invalidate()
+
+    def present(self):
+        if self.dirty and not self.dirty.force_next: self.dirty.present()
+        else:
+            pygame.display.flip()
+            if self.dirty: self.dirty.prev = []
+
+def is_headless(argv=None):
+    """--headless 인자나 RPG_HEADLESS=1 환경 변수"""
+    argv = sys.argv[1:] if argv is None else argv
+    return "--headless" in argv or os.environ.get("RPG_HEADLESS", "") not in ("", "0")
+
+def run_seed(argv=None):
+    """--seed N 인자나 RPG_SEED 환경 변수. 없으면 None (RngRegistry가 무작위로 정함)"""
+    argv = sys.argv[1:] if argv is None else argv
+    if "--seed" in argv:
+        i = argv.index("--seed")
+        if i+1 < len(argv): return int(argv[i+1])
+    env = os.environ.get("RPG_SEED", "")
+    return int(env) if env else None
+
 # ==================
 # main loop
 # ==================
-def main():
+def main(headless=None):
+    if headless is None: headless = is_headless()
+    if headless:
+        # 창 없이 실행: SDL 더미 비디오 드라이버, 폰트/표면 생성 안 함
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
     pygame.init()
-    pygame.display.set_caption("RPG - FSM/BT • Director • MapGen • Meta • Mods")
-    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 22)
-    font_big = pygame.font.SysFont(None, 42)
 
     bus = EventBus()
     meta = load_meta(META_PATH)
 
     options = load_options()
-    keymap = options["ketmap"]
-    levels_data = choose_levels_data()
+    if headless:
+        renderer = NullRenderer()
+    else:
+        pygame.display.set_caption("RPG - FSM/BT • Director • MapGen • Meta • Mods")
+        screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+        font = pygame.font.SysFont(None, 22)
+        font_big = pygame.font.SysFont(None, 42)
+        dirty = DirtyRects(screen.get_rect()) if options.get("dirty_rects") else None
+        renderer = PygameRenderer(screen, font, font_big, dirty)
+    keymap = options["keymap"]
+    rng = RngRegistry(run_seed())
+    levels_data = choose_levels_data(rng)
     drops_data = load_drops_data()
 
     # 콘텐츠 로드(무기/유물) - 모드 병합은 엔진에서 처리됨
     wep_dict = load_weapons(DATA_DIR / "weapons.json")
     relic_dict = load_relics(DATA_DIR / "relics.json")
 
-    world = World(levels_data, options=options, drops=drops_data, wep_dict=wep_dict, relic_dict=relic_dict)
+    world = World(levels_data, options=options, drops=drops_data, wep_dict=wep_dict, relic_dict=relic_dict, rng=rng)
     player = world.player
 
     # 시작 무기 장착(로드 전에 기본 세팅, 로드 시 덮어씀)
@@ -959,8 +1241,8 @@ def main():
     #메타 해금 반영
     patch_shop(shop_ui, shop_lineup(meta))
 
-    # 그폰 디렉터
-    director = Director(world, factories={"enemy": Enemy, "ranged": RangedEnemy})
+    # 그폰 디렉터 (World.step이 갱신)
+    world.director = Director(world, factories={"enemy": Enemy, "ranged": RangedEnemy})
 
     paused = False
     rebinding = False
@@ -968,8 +1250,8 @@ def main():
     won = False
     dead = False
     screenshake = 0.0
-
-    fow_surface = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
+    acc = 0.0   # 고정 스텝 누적 시간
+    want_attack = want_skill1 = False
 
     help_lines = [
     "Move: WASD/Arrows. Atack: Space. Dash: Shift. Skill: Q  ESC: Pause",
@@ -977,17 +1259,21 @@ def main():
     "Pause: 1/2/3 difficulty. [ / ] FOV  V shake. K: rebind keys",
     ]
 
-    # 독 파라미터(스킬/무기 공통)
-    POISON_CHANCE = 0.35
-    POISON_ADD = 1.5
-    POISON_TICK = 0.5
-    POISON_DMG = 1
-
-    def enemy_status_update(ent, dt):
-        ent.tick_effects(dt)
+    # 메타 진행: 시뮬레이션 이벤트 구독
+    def meta_on(name, shop_refresh=False):
+        def fn(**kw):
+            on_event(meta, name, **({k: v for k, v in kw.items() if k in ("item", "level")}))
+            if shop_refresh: patch_shop(shop_ui, shop_lineup(meta))    # 해금 반영 상점 라인업 갱신
+            save_meta(META_PATH, meta)
+        bus.on(name, fn)
+    meta_on("enemy_died"); meta_on("pickup"); meta_on("arena_clear", shop_refresh=True)
 
     while True:
-        dt = clock.tick(FPS)/1000.0
+        if headless:
+            # 헤드리스는 기다리지 않고 고정 dt로 최대 속도 진행
+            clock.tick(); frame_dt = 1.0/FPS
+        else:
+            frame_dt = clock.tick(FPS)/1000.0
 
         # 입력 처리
         for event in pygame.event.get():
@@ -1039,7 +1325,7 @@ def main():
                             world.player.weapon.on_equip(world.player)
                         apply_relics_to_player(world.player, relic_dict)
                     elif event.key == pygame.K_LEFTBRACKET:
-                        options["fov_radius"] = max(80, options["foc_radius"]-10); save_options(options)
+                        options["fov_radius"] = max(80, options["fov_radius"]-10); save_options(options)
                     elif event.key == pygame.K_RIGHTBRACKET:
                         options["fov_radius"] = min(280, options["fov_radius"]+10); save_options(options)
                     elif event.key == pygame.K_v:
@@ -1066,30 +1352,11 @@ def main():
                             if shop_ui.try_buy(player, "relic_boots", wep_dict, relic_dict): pass
                         elif event.key in keymap["shop"]:
                             shop_ui.toggle(False)
-                    # 공격
+                    # 공격 / 스킬1 (다음 스텝 입력으로 전달)
                     elif event.key in keymap["attack"] and not (dead or won):
-                        if player.can_attack():
-                            player.attack()
-                            poison_chance_eff = POISON_CHANCE + player.poison_bonus
-                            hit = player.weapon.attack(
-                                player, world,
-                                poison_chance=poison_chance_eff,
-                                poison_add=POISON_ADD, poison_tick=POISON_TICK, poison_dmg=POISON_DMG
-                            ) if player.weapon else False
-                            if hit: screenshake = 0.18
-                    # 스킬1: 포이즌 노바
+                        want_attack = True
                     if event.key in keymap["skill1"] and not (paused or dead or won):
-                        px, py = player.center()
-                        radius = 80
-                        any_hit = False
-                        for e in world.enemies + world.ranged:
-                            if e.alive():
-                                ex, ey = e.center()
-                                if (ex-px)**2 + (ey-py)**2 <= radius*radius:
-                                    add_or_stack_poison(e, base_duration=1.5, dmg_per_tick=POISON_DMG, tick=POISON_TICK, cap_duration=6.0)
-                                    any_hit = True
-                        if any_hit:
-                            screenshake = max(screenshake, 0.2)
+                        want_skill1 = True
                 
                 # 저장/불러오기
                 if event.key in (pygame.K_F5, pygame.K_F6, pygame.K_F7):
@@ -1105,170 +1372,67 @@ def main():
                         world.options = options
                         world.wep_dict = wep_dict
                         world.relic_dict = relic_dict
+                        saved_seed = payload["world"].get("run_seed")
+                        if AUTO_MAPGEN and saved_seed is not None and saved_seed != world.rng.seed:
+                            # 저장 당시 런 시드로 맵 세트를 다시 만들어 같은 맵 위에 복원
+                            world.rng.reseed(saved_seed)
+                            world.levels_data = choose_levels_data(world.rng)
                         world.load_state(payload["world"])
                         player = world.player
                         paused=False; dead=False; won=False; shop_ui.option=False
                         patch_shop(shop_ui, shop_lineup(meta))
 
         if paused:
-            draw_world(screen, world, font, 0.0, fow_surface, options, shop_ui)
+            renderer.draw_world(world, 0.0, options, shop_ui)
             lines = ["PAUSED"] + help_lines + [
                 f"Difficulty: {options['difficulty']} FOV: {options['fov_radius']} Shake: {options['screenshake']}"]
             if rebinding:
-                actions = ACTION_ORDER[rebind_idx] 
+                action = ACTION_ORDER[rebind_idx]
                 cur = ", ".join(key_name(k) for k in options["keymap"].get(action, []))
                 lines += ["", "KEY REBIND MODE",
                           f"Press a key for: {ACTION_LABEL[action]}",
                           f"(current: {cur if cur else 'None'})"]
             else:
-                lines += ["", "keymap: " + ", ".join(
-                    f"{ACTION_LABEL[a]}={ '/'.join(key_name(k) for k in options['keymap'][a]) }" for a in ACTION_ORDER)]
+                lines += ["", KEYMAP_LINE.get(tuple(tuple(options["keymap"][a]) for a in ACTION_ORDER))]
                 lines += ["(Press K to start rebinding)"]
-            draw_center_message(screen, font_big, lines)
-            pygame.display.flip()
+            renderer.draw_center_message(lines)
+            renderer.present()
+            acc = 0.0
             continue
 
-        if not (dead or won):
-            # 이동 입력
-            keys = pygame.key.get_pressed()
-            dx = is_down(keys, keymap, "right") - is_down(keys, keymap, "left")
-            dy = is_down(keys, keymap, "down") - is_down(keys, keymap, "up")
-            if dx or dy: player.last_dir = normalize(dx, dy)
-
-            on_water = world.tile_at(*player.center(), world.water)
-            colliders = world.soloid_colliders()
-
-            if player.dashing: player.update_dash(dt, colliders)
-            else: player.move(dx, dy, dt, colliders, slow=on_water)
-            player.update_timers(dt)
-            
-            # Arena Trigger
-            if not world.arena_active and any(t.colliderect(player.rect) for t in world.triggers):
-                world.arena_active = True
-
-            #  적 AI + 상태 이상 틱 + 사망 드랍
-            for e in world.enemies:
-                if e.alive():
-                    e.ai(player.center(), world.walls, dt, world=world)
-                    if e.try_attack(player): screenshake = max(screenshake, 0.22)
-                    enemy_status_update(e, dt)
-                elif not e.dead_drop_done:
-                    e.dead_drop_done = True
-                    world.maybe_drop("enemy", e.center(), elite=e.elite)
-                    bus.emit("enemy_died", kind="enemy", pos=e.center(), elite=e.elite)
-                    on_event(meta, "enemy_died"); save_meta(META_PATH, meta)
-            for e in world.ranged:
-                if e.alive():
-                    e.ai(player.center(), world.walls, dt, world.bullets)
-                    enemy_status_update(e, dt)
-                elif not e.dead_drop_done:
-                    e.dead_drop_done = True
-                    world.maybe_drop("ranged", e.center(), elite=e.elite)
-                    bus.emit("enemy_died", kind="ranged", pos=e.center(), elite=e.elite)
-                    on_event(meta, "enemy_died"); save_meta(META_PATH, meta)
-
-            if world.boss and world.boss.alive():
-                world.boss.ai(player.center(), world.walls, dt, world.bullets, world.lasers, world)
-            elif world.boss and not world.boss.alive():
-                if getattr(world.boss, "_drop_done", False) is False:
-                    world.boss._drop_done = True
-                    world.maybe_drop("boss", world.boss.center(), elite=True)
-                    bus.emt("enemy_died", kind="boss", pos=world.boss.center(), elite=True)
-                    on_event(meta, "enemy_died"); save_meta(META_PATH, meta)
-
-            # 탄환
-            for b in world.bullets:
-                if b.alive:
-                    b.update(dt, world.walls, player.center())
-                    if b.alive and b.rect().colliderect(player.rect):
-                        player.hurt(b.dmg); b.alive=False; screenshake=max(screenshake,0.2)
-            world.bullets = [b for b in world.bullets if b.alive]
-
-            # 레이저
-            hit_by_laser = False
-            for lz in world.lasers:
-                if lz.update(dt, world.walls, world.player.center(), world.player.r):
-                    hit_by_laser = True
-            if hit_by_laser:
-                player.hurt(2)
-            world.lasers = [lz for lz in world.lasers if not lz.done]
-
-            # 상호작용: 포션 / 열쇠 / 코인 / 문
-            if not shop_ui.open:
-                take=[]
-                for r in world.potions:
-                    if r.colliderect(player.rect): take.append(r); player.hp = clamp(player.hp+2, 0, player.hp_max)
-                for r in take: world.potions.remove(r)
-                take=[]
-                for r in world.kets:
-                    if r.colliderect(player.rect): take.append(r); player.keys += 1
-                for r in take: world.keys.remove(r)
-                take=[]
-                for r in world.coins:
-                    if r.colliderect(player.rect):
-                        take.append(r); player.coins += 1
-                        bus.emit("pickup", item="coin", pos=r.center); on_event(meta, "pickup", item="coin"); save_meta(META_PATH, meta)
-                for r in take: world.coins.remove(r)
-
-                # 문 열기
-                still=[]
-                for r in world.doors:
-                    if r.colliderect(player.rect):
-                        if player.keys>0:
-                            player.keys-=1; world.open_doors.append(r); player.rect.y -= 2
-                        else:
-                            still.append(r)
-                    else:
-                        still.append(r)
-                world.doors = still
-
-            # 아레나 클리어 체크
-            if world.arena_active:
-                alive_count = (sum(1 for e in world.enemies if e.alive()) +
-                               sum(1 for e in world.ranged if e.alive()) +
-                               (1 if (world.boss and world.boss.alive()) else 0))
-                if alive_count==0:
-                    world.arena_active=False
-                    for r in world.arena_doors: world.open_doors.append(r)
-                    world.arena_doors=[]
-                    bus.emit("arena_clear", level=world.level_index)
-                    on_event(meta, "arena_clear", level=world.level_index)
-                    #해금 반영 상점 라인업 갱신
-                    patch_shop(shop_lineup(meta))
-                    save_meta(META_PATH, meta)
-            
-            # 디랙터(뤠이브 자동화)
-            director.update(dt)
-
-            # 승리/사망/스테이지 전화
-            if player.hp<=0: dead=True
-            if world.goal and player.rect.colliderect(world.goal):
-                advanced = world.next_level()
-                if not advanced: won=True
-                else:
-                    player = world.player
-                    if not player.weapon and "Rusty Sword" in wep_dict:
-                        player.weapon = Weapon("Rusty Sword", wep_dict["Rusty Sword"])
-                        player.weapon.on_equip(player)
-                    apply_relics_to_player(player, relic_dict)
-                    shop_ui.open=False
-
-        # 셰이크 감쇠
-        if screenshake>0: screenshake -= dt
-        else: screenshake = 0.0
-
-        #render
-        draw_world(screen, world, font, screenshake, fow_surface, options, shop_ui)
+        # 입력 -> SimInput (공격/스킬은 이번 프레임 첫 스텝에만)
+        keys = pygame.key.get_pressed()
+        dx = is_down(keys, keymap, "right") - is_down(keys, keymap, "left")
+        dy = is_down(keys, keymap, "down") - is_down(keys, keymap, "up")
+        inp = SimInput(move=(dx, dy), attack=want_attack, skill1=want_skill1, shop_open=shop_ui.open)
+
+        # 고정 스텝: 프레임 시간을 누적해 SIM_DT 단위로 진행 (밀린 시간은 MAX_SIM_STEPS 스텝까지만)
+        acc = min(acc + frame_dt, SIM_DT*MAX_SIM_STEPS)
+        while acc >= SIM_DT:
+            acc -= SIM_DT
+            if not (dead or won):
+                for ev in world.step(inp, SIM_DT):
+                    if ev.name == "shake": screenshake = max(screenshake, ev.data["amount"])
+                    elif ev.name == "player_died": dead = True
+                    elif ev.name == "won": won = True
+                    elif ev.name == "level_advanced": shop_ui.open = False
+                    bus.emit(ev.name, **ev.data)
+                inp = inp.held(); want_attack = want_skill1 = False
+            # 셰이크 감쇠
+            if screenshake>0: screenshake -= SIM_DT
+            else: screenshake = 0.0
+        player = world.player
+
+        #render (남은 누적 시간 비율로 보간)
+        renderer.draw_world(world, screenshake, options, shop_ui, acc / SIM_DT)
         if won:
-            draw_center_message(screen, font_big, ["YOU CLEARED EVERYTHING!", "Pause to quit F9/F10/F11: load slot"])
+            renderer.draw_center_message(["YOU CLEARED EVERYTHING!", "Pause to quit F9/F10/F11: load slot"])
         elif dead:
-            draw_center_message(screen, font_big, ["YOU DIED", "Pause to quit F9/F10/F11: load slot"])
+            renderer.draw_center_message(["YOU DIED", "Pause to quit F9/F10/F11: load slot"])
         else:
             if (pygame.time.get_ticks()//1000)%6<3:
-                tip = "FSM/BT • Director • MapGen • Meta • Mods"
-                screen.blit(font.render(tip, True, (240,240,240)), (8,48))
-        
-        pygame.display.flip()
+                renderer.draw_tip("FSM/BT • Director • MapGen • Meta • Mods")
+        renderer.present()
 
 # ========================
 # options load / save
@@ -0,0 +1,43 @@
+import pygame
+
+class SpriteBank:
+    """
+    미리 구워 둔 액터/탄 표면.
+    - 액터: (종류, 엘리트, 중독, 크기)별 한 장 (몸통 + 엘리트/독 테두리까지 포함)
+    - 탄: 반지름별 원 한 장
+    draw_world는 레이어마다 (표면, 위치) 목록을 모아 Surface.blits 한 번으로 제출
+    """
+    PAD = 3     # 엘리트 테두리(inflate 6) 만큼 여백
+
+    def __init__(self, colors):
+        self.colors = colors
+        self.actors = {}
+        self.bullets = {}
+
+    def actor(self, kind, elite, poisoned, size):
+        key = (kind, elite, poisoned, size)
+        sf = self.actors.get(key)
+        if sf is None:
+            p = self.PAD
+            w, h = size
+            sf = pygame.Surface((w + 2*p, h + 2*p), pygame.SRCALPHA)
+            body = pygame.Rect(p, p, w, h)
+            if kind == "boss": pygame.draw.rect(sf, self.colors["boss"], body, border_radius=4)
+            else: pygame.draw.rect(sf, self.colors[kind], body)
+            if elite: pygame.draw.rect(sf, self.colors["elite"], body.inflate(6,6), 2)
+            if poisoned: pygame.draw.rect(sf, self.colors["poison_glow"], body.inflate(4,4), 2)
+            self.actors[key] = sf
+        return sf
+
+    def actor_blit(self, kind, elite, poisoned, rect):
+        """rect 위치에 그릴 (표면, 좌상단) 한 쌍"""
+        return self.actor(kind, elite, poisoned, rect.size), (rect.x - self.PAD, rect.y - self.PAD)
+
+    def bullet(self, r, color):
+        key = (r, color)
+        sf = self.bullets.get(key)
+        if sf is None:
+            sf = pygame.Surface((2*r + 1, 2*r + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sf, color, (r, r), r)
+            self.bullets[key] = sf
+        return sf
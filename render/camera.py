@@ -0,0 +1,39 @@
+import pygame
+
+class Camera:
+    """
+    플레이어를 따라가는 뷰포트.
+    - (x, y): 화면 좌상단에 오는 월드 좌표. 맵 밖이 보이지 않게 가장자리에서 멈춤
+    - 맵이 화면보다 작은 축은 0에 고정 (기존 배치 그대로)
+    - 월드 -> 화면 변환과 화면 밖 컬링을 모든 그리기 경로가 공유
+    """
+    def __init__(self, view_w, view_h, world_w, world_h):
+        self.view_w, self.view_h = view_w, view_h
+        self.world_w, self.world_h = world_w, world_h
+        self.x = self.y = 0
+
+    def follow(self, cx, cy):
+        self.x = int(min(max(cx - self.view_w//2, 0), max(0, self.world_w - self.view_w)))
+        self.y = int(min(max(cy - self.view_h//2, 0), max(0, self.world_h - self.view_h)))
+
+    @property
+    def offset(self):
+        return (self.x, self.y)
+
+    @property
+    def rect(self):
+        """월드 좌표계의 보이는 영역"""
+        return pygame.Rect(self.x, self.y, self.view_w, self.view_h)
+
+    def to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def apply(self, rect):
+        return rect.move(-self.x, -self.y)
+
+    def visible(self, rect):
+        return self.rect.colliderect(rect)
+
+    def visible_point(self, x, y, pad=0):
+        return (self.x - pad <= x < self.x + self.view_w + pad and
+                self.y - pad <= y < self.y + self.view_h + pad)
@@ -0,0 +1,59 @@
+import pygame
+
+class DirtyRects:
+    """
+    선택형 부분 갱신 렌더러 (options["dirty_rects"]).
+    - 프레임마다 움직이는 것(액터/탄/레이저/HUD/미니맵)의 사각형을 모으고
+      지난 프레임 사각형과 합쳐 그 영역만 배경/안개를 복원하고 display.update(rects)
+    - 장면 키(레벨, 문 오버레이, 안개, 아이템 수, 상점 창)가 바뀌거나
+      화면 흔들림/오버레이 화면이면 전체 다시 그리고 flip
+    """
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.prev = []
+        self.cur = []
+        self.key = None
+        self.full = True
+        self.force_next = True
+        self.stats = {"full": 0, "partial": 0}
+
+    def begin(self, key, force=False):
+        """프레임 시작. 이번 프레임을 전체로 그릴지 결정"""
+        self.full = force or self.force_next or key != self.key
+        self.key = key
+        self.force_next = False
+        self.cur = []
+        return self.full
+
+    def invalidate(self):
+        """다음 프레임 전체 갱신 (일시정지/메시지 화면 뒤 등)"""
+        self.force_next = True
+
+    def add(self, rect):
+        r = pygame.Rect(rect).clip(self.screen_rect)
+        if r.w and r.h: self.cur.append(r)
+
+    def restore_areas(self):
+        """
+        배경/안개를 다시 깔아야 할 영역 = 지난 프레임 + 이번 프레임.
+        안개는 반투명이라 두 번 깔면 진해지므로 겹치는 사각형은 합쳐서 서로소로 만듦
+        """
+        out = []
+        for r in self.prev + self.cur:
+            r = r.copy()
+            i = r.collidelist(out)
+            while i >= 0:
+                r.union_ip(out.pop(i))
+                i = r.collidelist(out)
+            out.append(r)
+        return out
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+            self.stats["full"] += 1
+        else:
+            pygame.display.update(self.prev + self.cur)
+            self.stats["partial"] += 1
+        self.prev = self.cur
+        self.cur = []
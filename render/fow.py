@@ -0,0 +1,75 @@
+import numpy as np
+import pygame
+
+FOW_UNSEEN = 220    # 가본 적 없는 타일 어둠
+FOW_MEMORY = 120    # 기억만 있는 타일 어둠
+
+class FogOfWar:
+    """
+    타일 단위 전장의 안개.
+    - explored/visible: (w, h) bool 배열 (surfarray와 같은 x, y 순서)
+    - 시야 원은 타일 중심 좌표 배열로 한 번에 계산
+    - 알파는 타일당 1픽셀 저해상도 표면(small)에만 씀. 플레이어 타일이나 시야 반경이 바뀐 때만 다시 계산
+    - 화면에는 카메라가 걸치는 타일 창만 확대한 표면(view)을 씀.
+      확대는 안개가 바뀌었거나 카메라가 다른 타일로 넘어간 때만 (비용이 맵이 아니라 화면 크기에 비례)
+    """
+    def __init__(self, w, h, tile, seen=()):
+        self.w, self.h, self.tile = w, h, tile
+        self.explored = np.zeros((w, h), dtype=bool)
+        self.visible = np.zeros((w, h), dtype=bool)
+        for tx, ty in seen:
+            if 0 <= tx < w and 0 <= ty < h: self.explored[tx, ty] = True
+        c = np.arange(max(w, h), dtype=np.float64) * tile + tile/2
+        self.cx = c[:w, None]
+        self.cy = c[None, :h]
+        self.small = pygame.Surface((w, h), pygame.SRCALPHA)
+        self.small.fill((0, 0, 0, 0))
+        self.view = None
+        self.view_key = None
+        self.key = None
+        self.recomputes = 0
+        self.rescales = 0
+
+    def update(self, px, py, radius):
+        """시야 갱신. 이번에 새로 밝혀진 타일 목록 반환 (재계산 안 하면 빈 목록)"""
+        T = self.tile
+        ptx, pty = int(px)//T, int(py)//T
+        key = (ptx, pty, radius)
+        if key == self.key: return []
+        self.key = key
+        self.recomputes += 1
+        ox, oy = ptx*T + T/2, pty*T + T/2
+        self.visible = (self.cx - ox)**2 + (self.cy - oy)**2 <= radius*radius
+        new = self.visible & ~self.explored
+        self.explored |= self.visible
+        alpha = np.where(self.explored, FOW_MEMORY, FOW_UNSEEN).astype(np.uint8)
+        alpha[self.visible] = 0
+        px_alpha = pygame.surfarray.pixels_alpha(self.small)
+        px_alpha[...] = alpha
+        del px_alpha    # 표면 잠금 해제
+        return [(int(x), int(y)) for x, y in np.argwhere(new)]
+
+    def _view(self, offset, size):
+        """화면(size)을 덮는 타일 창을 확대한 표면과 그 화면 좌표"""
+        T = self.tile
+        ox, oy = offset
+        tx0, ty0 = max(0, ox // T), max(0, oy // T)
+        tx1 = min(self.w, -(-(ox + size[0]) // T))
+        ty1 = min(self.h, -(-(oy + size[1]) // T))
+        if tx1 <= tx0 or ty1 <= ty0: return None, (0, 0)
+        key = (tx0, ty0, tx1, ty1, self.recomputes)
+        if key != self.view_key:
+            self.view_key = key
+            self.rescales += 1
+            sub = self.small.subsurface((tx0, ty0, tx1-tx0, ty1-ty0))
+            self.view = pygame.transform.scale(sub, ((tx1-tx0)*T, (ty1-ty0)*T))
+        return self.view, (tx0*T - ox, ty0*T - oy)
+
+    def draw(self, screen, offset=(0, 0)):
+        view, pos = self._view(offset, screen.get_size())
+        if view is not None: screen.blit(view, pos)
+
+    def draw_area(self, screen, area, offset=(0, 0)):
+        """화면 좌표 area에만 안개를 다시 씌움"""
+        view, pos = self._view(offset, screen.get_size())
+        if view is not None: screen.blit(view, area, area=area.move(-pos[0], -pos[1]))
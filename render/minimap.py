@@ -0,0 +1,71 @@
+import pygame
+
+class Minimap:
+    """
+    레벨별 미니맵 캐시.
+    - 정적 표면: 가본 타일의 벽/출구/상점 + 문/아레나 도어.
+      world.seen 크기나 문 목록이 바뀐 프레임에만 다시 그림
+    - 동적 마커(적/보스/코인/플레이어)는 매 프레임 그 위에 찍음.
+      적은 공간 해시에서 시야 반경 안만 조회
+    """
+    def __init__(self, level, tile, scale, colors):
+        self.level = level
+        self.tile = tile
+        self.scale = scale
+        self.colors = colors
+        self.w = max((len(row) for row in level), default=0)
+        self.h = len(level)
+        self.world_w, self.world_h = self.w*tile, self.h*tile
+        self.cell = max(1, int(tile*scale))
+        self.surface = pygame.Surface((int(self.w*tile*scale), int(self.h*tile*scale)))
+        self.key = None
+        self.rebuilds = 0
+
+    def _pos(self, x, y):
+        return int(x*self.scale), int(y*self.scale)
+
+    def sync(self, world):
+        key = (len(world.seen),
+               tuple((r.x, r.y) for r in world.doors),
+               tuple((r.x, r.y) for r in world.arena_doors))
+        if key == self.key: return
+        self.key = key
+        self.rebuilds += 1
+        s, T, c = self.surface, self.tile, self.cell
+        s.fill((18,18,22))
+        for tx, ty in world.seen:
+            if not (0 <= ty < self.h and 0 <= tx < len(self.level[ty])): continue
+            ch = self.level[ty][tx]
+            rect = pygame.Rect(*self._pos(tx*T, ty*T), c, c)
+            if ch=='#': pygame.draw.rect(s, (70,70,90), rect)
+            elif ch=='G': pygame.draw.rect(s, (30,120,40), rect)
+            elif ch=='S': pygame.draw.rect(s, (100,180,100), rect)
+        for r in world.doors: pygame.draw.rect(s, self.colors["door"], pygame.Rect(*self._pos(r.x, r.y), c, c))
+        for r in world.arena_doors: pygame.draw.rect(s, self.colors["arena"], pygame.Rect(*self._pos(r.x, r.y), c, c))
+
+    def draw(self, screen, world, x0, y0, view_r, view=None):
+        self.sync(world)
+        frame = pygame.Rect(x0-2, y0-2, self.surface.get_width()+4, self.surface.get_height()+4)
+        pygame.draw.rect(screen, (0,0,0), frame)
+        screen.blit(self.surface, (x0, y0))
+        T = self.tile
+        for r in world.coins:
+            if (r.x//T, r.y//T) in world.seen:
+                mx, my = self._pos(*r.center)
+                pygame.draw.circle(screen, self.colors["coin"], (x0+mx, y0+my), 1)
+        px, py = world.player.center()
+        for e in world.spatial.query_radius(px, py, view_r):
+            mx, my = self._pos(*e.center())
+            pygame.draw.circle(screen, self.colors["enemy"], (x0+mx, y0+my), 2)
+        boss = world.boss
+        if boss and boss.alive() and (boss.center()[0]-px)**2 + (boss.center()[1]-py)**2 <= view_r*view_r:
+            mx, my = self._pos(*boss.center())
+            pygame.draw.circle(screen, self.colors["boss"], (x0+mx, y0+my), 3)
+        if view is not None and (view.w < self.world_w or view.h < self.world_h):
+            # 맵이 화면보다 크면 지금 보이는 영역 표시
+            vx, vy = self._pos(view.x, view.y)
+            vw, vh = self._pos(view.w, view.h)
+            pygame.draw.rect(screen, (200,200,200), (x0+vx, y0+vy, vw, vh), 1)
+        mx, my = self._pos(px, py)
+        pygame.draw.circle(screen, (250,250,90), (x0+mx, y0+my), max(2, int(world.player.r*self.scale)))
+        return frame
@@ -0,0 +1,12 @@
+class NullRenderer:
+    """
+    헤드리스 렌더러. 창/폰트/표면 없이 같은 인터페이스만 제공하고 아무것도 그리지 않음
+    (자동 테스트, 밸런스 시뮬레이션, CI)
+    """
+    headless = True
+
+    def draw_world(self, world, shake, options, shop_ui, alpha=1.0): pass
+    def draw_center_message(self, lines): pass
+    def draw_tip(self, text): pass
+    def invalidate(self): pass
+    def present(self): pass
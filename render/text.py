@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+class TextCache:
+    """
+    font.render 결과 캐시. 키 (폰트, 문자열, 색, 안티앨리어싱), LRU로 size개까지 보관.
+    HUD/일시정지 화면처럼 매 프레임 같은 글자를 다시 굽는 비용을 없앰
+    """
+    def __init__(self, size=256):
+        self.size = size
+        self.cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def render(self, font, text, color, aa=True):
+        key = (font, text, tuple(color), aa)
+        sf = self.cache.get(key)
+        if sf is not None:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return sf
+        self.stats["misses"] += 1
+        sf = font.render(text, aa, color)
+        self.cache[key] = sf
+        if len(self.cache) > self.size: self.cache.popitem(last=False)
+        return sf
+
+class CachedLine:
+    """입력 값 튜플이 바뀐 때만 문자열을 다시 만드는 한 줄 (HUD, 키맵 표시 등)"""
+    def __init__(self, build):
+        self.build = build
+        self.key = None
+        self.text = ""
+
+    def get(self, *vals):
+        if vals != self.key:
+            self.key = vals
+            self.text = self.build(*vals)
+        return self.text
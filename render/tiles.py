@@ -0,0 +1,85 @@
+import pygame
+
+class TileLayer:
+    """
+    레벨 배경 캐시 (청크 단위).
+    - 맵을 chunk x chunk 타일 조각으로 나누고, 화면에 보이는 조각만 표면으로 그려 둠
+      (벽/물/출구/바닥 + 문/아레나 도어/열린 문/상점 오버레이)
+    - 오버레이 목록이 바뀐 프레임에만 조각 캐시를 비우고, 다음에 보일 때 다시 그림
+    - 화면 밖 조각은 보이는 조각 수의 두 배를 넘으면 버림 -> 메모리/그리기 비용이 맵이 아니라 화면 크기에 비례
+    """
+    def __init__(self, level, tile, colors, chunk=16):
+        self.level = level
+        self.tile = tile
+        self.colors = colors
+        self.chunk = chunk
+        self.w = max((len(row) for row in level), default=0)
+        self.h = len(level)
+        self.chunks = {}        # (cx, cy) -> Surface
+        self.overlays = ((), (), (), ())
+        self.key = None
+        self.rebuilds = 0       # 오버레이 변경 횟수
+        self.renders = 0        # 조각을 그린 횟수
+
+    @staticmethod
+    def _sig(rects):
+        return tuple((r.x, r.y, r.w, r.h) for r in rects)
+
+    def sync(self, doors, arena_doors, open_doors, shops):
+        """오버레이 목록이 지난번과 다르면 조각 캐시를 비움"""
+        key = (self._sig(doors), self._sig(arena_doors), self._sig(open_doors), self._sig(shops))
+        if key == self.key: return
+        self.key = key
+        self.rebuilds += 1
+        self.overlays = (list(doors), list(arena_doors), list(open_doors), list(shops))
+        self.chunks.clear()
+
+    def _render(self, cx, cy):
+        T, n = self.tile, self.chunk
+        size = n*T
+        s = pygame.Surface((size, size))
+        s.fill(self.colors["bg"])
+        x0, y0 = cx*n, cy*n
+        for ty in range(y0, min(y0+n, self.h)):
+            row = self.level[ty]
+            for tx in range(x0, min(x0+n, len(row))):
+                ch = row[tx]
+                r = pygame.Rect((tx-x0)*T, (ty-y0)*T, T, T)
+                if ch=='#': pygame.draw.rect(s, self.colors["wall"], r)
+                elif ch=='~': pygame.draw.rect(s, self.colors["water"], r)
+                elif ch=='G': pygame.draw.rect(s, self.colors["goal"], r)
+                else: pygame.draw.rect(s, self.colors["floor"], r)
+        area = pygame.Rect(x0*T, y0*T, size, size)
+        doors, arena_doors, open_doors, shops = self.overlays
+        for lst, color, inset in ((doors, self.colors["door"], 0), (arena_doors, self.colors["arena"], 0),
+                                  (open_doors, (180, 140, 90), -8), (shops, self.colors["shop"], -6)):
+            for r in lst:
+                if r.colliderect(area): pygame.draw.rect(s, color, r.inflate(inset, inset).move(-area.x, -area.y))
+        self.renders += 1
+        return s
+
+    def draw_area(self, screen, area, offset=(0, 0)):
+        """화면 좌표 area만 다시 그림 (겹치는 조각만 blit)"""
+        ox, oy = offset
+        size = self.chunk*self.tile
+        wx0, wy0 = area.x + ox, area.y + oy
+        cx0, cy0 = max(0, wx0 // size), max(0, wy0 // size)
+        cx1 = min((self.w*self.tile - 1) // size, (wx0 + area.w - 1) // size)
+        cy1 = min((self.h*self.tile - 1) // size, (wy0 + area.h - 1) // size)
+        clip = screen.get_clip()
+        screen.set_clip(area.clip(clip))
+        used = set()
+        for cy in range(cy0, cy1+1):
+            for cx in range(cx0, cx1+1):
+                s = self.chunks.get((cx, cy))
+                if s is None: s = self.chunks[(cx, cy)] = self._render(cx, cy)
+                used.add((cx, cy))
+                screen.blit(s, (cx*size - ox, cy*size - oy))
+        screen.set_clip(clip)
+        return used
+
+    def draw(self, screen, world, offset=(0, 0)):
+        self.sync(world.doors, world.arena_doors, world.open_doors, world.shops)
+        used = self.draw_area(screen, screen.get_rect(), offset)
+        if len(self.chunks) > 2*len(used):
+            for k in [k for k in self.chunks if k not in used]: del self.chunks[k]
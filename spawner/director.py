@@ -1,5 +1,108 @@
 import random
 import math
+from collections import deque
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def ring_offsets(ring, radius):
+    """
+    (dx, dy) 타일 오프셋을 거리 링(int(hypot) // ring) 순으로 정렬한 표. 반경/링 폭마다 한 번만 만듦.
+    starts[k]: 링 k가 시작하는 인덱스 (링 k..j 오프셋은 offs[starts[k]:starts[j+1]]로 연속)
+    """
+    r = int(radius)
+    offs = sorted(((dx, dy) for dy in range(-r, r+1) for dx in range(-r, r+1)
+                   if math.hypot(dx, dy) <= radius),
+                  key=lambda o: int(math.hypot(*o)) // ring)
+    starts = [0]
+    for i, (dx, dy) in enumerate(offs):
+        k = int(math.hypot(dx, dy)) // ring
+        while len(starts) <= k: starts.append(i)
+    starts.append(len(offs))
+    return tuple(offs), tuple(starts)
+
+class SpawnIndex:
+    """
+    레벨별 스폰 후보 인덱스
+    - 후보: '.' 타일 중 스폰 사각형이 걸치는 2x2 타일이 비어 있고 플레이어(아레나 안)에서 닿는 곳.
+      격자 version이 바뀌거나 플레이어가 닿는 영역을 벗어났을 때만 BFS로 다시 구해 비트맵(cand)에 표시
+    - 거리 링 오프셋 표(ring_offsets)는 레벨 크기로 한 번만 만들고, 뽑을 때 플레이어 타일 + 오프셋을 비트맵으로 확인.
+      플레이어가 움직여도 다시 나눌 것이 없음
+    """
+    def __init__(self, world, ring=2, rng=None):
+        self.world = world
+        self.rng = rng or random
+        self.grid = world.grid
+        self.ring = ring
+        self.floor = [(tx, ty) for ty, row in enumerate(world.level) for tx, ch in enumerate(row) if ch == '.']
+        self.offs, self.starts = ring_offsets(ring, math.hypot(self.grid.w, self.grid.h))
+        self.version = None
+        self.reach = None
+        self.cand = bytearray(self.grid.w*self.grid.h)
+        self.count = 0
+        self.bbox = None    # 후보 타일 경계 (x0, y0, x1, y1)
+
+    def _reachable(self, start):
+        g = self.grid
+        W, H = g.w, g.h
+        cells, mask = g.cells, g.solid_mask
+        seen = bytearray(W*H)
+        sx, sy = start
+        if not g.in_bounds(sx, sy): return seen
+        seen[sy*W+sx] = 1
+        q = deque([start])
+        while q:
+            x, y = q.popleft()
+            for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
+                nx, ny = x+dx, y+dy
+                if not (0 <= nx < W and 0 <= ny < H): continue
+                j = ny*W+nx
+                if seen[j] or cells[j] & mask: continue
+                seen[j] = 1
+                q.append((nx, ny))
+        return seen
+
+    def _refresh(self, ptx, pty):
+        g = self.grid
+        inside = g.in_bounds(ptx, pty) and self.reach is not None and self.reach[pty*g.w+ptx]
+        if g.version == self.version and inside: return
+        self.reach = self._reachable((ptx, pty))
+        W = g.w
+        cand = bytearray(W*g.h)
+        x0 = y0 = 1 << 30; x1 = y1 = -1
+        for tx, ty in self.floor:
+            if self.reach[ty*W+tx] and not (g.blocked(tx, ty) or g.blocked(tx+1, ty) or g.blocked(tx, ty+1) or g.blocked(tx+1, ty+1)):
+                cand[ty*W+tx] = 1
+                x0 = min(x0, tx); y0 = min(y0, ty); x1 = max(x1, tx); y1 = max(y1, ty)
+        self.cand = cand
+        self.count = sum(cand)
+        self.bbox = (x0, y0, x1, y1) if self.count else None
+        self.version = g.version
+
+    def pick(self, min_dist, tries=64):
+        """플레이어와 min_dist 이상 떨어진 후보 타일 중심 하나 (오프셋 tries번 뽑아 비트맵 확인). 없으면 None"""
+        g = self.grid
+        T, W, H = g.tile, g.w, g.h
+        px, py = self.world.player.center()
+        ptx, pty = g.tile_of(px, py)
+        self._refresh(ptx, pty)
+        if not self.count: return None
+        # 이 링부터는 (플레이어가 타일 안 어디에 있든) 대부분 충분히 멂. 경계는 개별 확인
+        kmin = max(0, int((min_dist - T) // (self.ring*T)))
+        # 후보 경계 상자의 가장 먼 모서리까지만 뽑음
+        x0, y0, x1, y1 = self.bbox
+        kmax = int(math.hypot(max(abs(x0-ptx), abs(x1-ptx)), max(abs(y0-pty), abs(y1-pty)))) // self.ring
+        starts = self.starts
+        lo = starts[min(kmin, len(starts)-1)]
+        hi = starts[min(kmax+1, len(starts)-1)]
+        if lo >= hi: return None
+        offs, cand, rng = self.offs, self.cand, self.rng
+        for _ in range(tries):
+            dx, dy = offs[rng.randrange(lo, hi)]
+            tx, ty = ptx+dx, pty+dy
+            if not (0 <= tx < W and 0 <= ty < H) or not cand[ty*W+tx]: continue
+            cx, cy = tx*T + T//2, ty*T + T//2
+            if math.hypot(px-cx, py-cy) >= min_dist: return (cx, cy)
+        return None
 
 class Director:
     """
@@ -15,6 +118,8 @@ class Director:
         self.accum = 0.0
         self.spawn_rate = 1.6 # budget/s
         self.stage_mult = 0.8
+        self.index = None   # 레벨별 SpawnIndex (격자가 바뀌면 새로 만듦)
+        self.rng = world.rng.stream("director")
 
     def update(self, dt):
         w = self.world
@@ -36,9 +141,9 @@ class Director:
         self.accum += self.spawn_rate * dt
         costs = {"enemy":1.0, "ranged":1.5}
         while alive < target and self.accum >= 1.0:
-            kind = "ranged" if random.random() < 0.35 else "enemy"
+            kind = "ranged" if self.rng.random() < 0.35 else "enemy"
             if self.accum < costs[kind]: break
-            pos = self._pick_spawn_pos(mis_dist=5*32)
+            pos = self._pick_spawn_pos(min_dist=5*32)
             if not pos: break
             self._spawn(kind, *pos)
             self.accum -= costs[kind]
@@ -50,33 +155,14 @@ class Director:
         if kind == "enemy":
             e = cls(x, y, elite=False)
             self.world.enemies.append(e)
+            self.world.spatial.insert(e)
         else:
             r = cls(x, y, elite=False)
             self.world.ranged.append(r)
+            self.world.spatial.insert(r)
 
     def _pick_spawn_pos(self, min_dist=160):
-        """바닥('.') 타일 중 플레이어와 멀고, 벽과 겹치지 않는 곳"""
-        level = self.world.level
-        tiles = []
-        for ty, row in enumerate(level):
-            for tx, ch in enumerate(row):
-                if ch == '.':
-                    cx, cy = tx*32+16, ty*32+16
-                    tiles.append((cx, cy))
-        random.shuffle(tiles)
-        px, py = self.world.player.center()
-        for cx, cy in tiles:
-            if math.hypot(px-cx, py-cy) < min_dist: continue
-            #벽 충돌 피하기
-            ok = True
-            for w in self.world.walls + self.world.doors + (self.world.arena_doors if self.world.arena_active else[]):
-                if w.collidepoint(cx, cy):
-                    ok = False; break
-            if ok: return (cx, cy)
-        return None
-
-
-
-        
-
-
+        """바닥('.') 타일 중 플레이어와 멀고, 충돌체와 겹치지 않는 곳 (레벨별 인덱스 조회)"""
+        if self.index is None or self.index.grid is not self.world.grid:
+            self.index = SpawnIndex(self.world, rng=self.rng)
+        return self.index.pick(min_dist)
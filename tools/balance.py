@@ -0,0 +1,181 @@
+"""
+몬테카를로 밸런스 시뮬레이션.
+
+시드 x 난이도 x 맵 시드 조합마다 헤드리스 World.step을 스크립트/랜덤 정책으로 돌리고
+결과를 열 단위 JSON 한 파일로 모음 ({"columns": {이름: [값...]}, "rows": n}).
+
+    python -m tools.balance --seeds 32 --difficulties Easy,Normal,Hard --map-seeds 1234,99 --jobs 8
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import main as game
+from engine.sim import SimInput
+from engine.content import load_weapons, load_relics
+from engine.actions import Weapon
+from engine.rng import RngRegistry
+from generators.mapgen import generate_level_set
+from spawner.director import Director
+
+COLUMNS = ["seed", "difficulty", "map_seed", "policy", "cleared", "time_to_clear", "sim_time",
+           "deaths", "damage_taken", "coins", "kills", "stage"]
+
+# ---- 정책: world -> SimInput ----
+class ScriptedPolicy:
+    """
+    가까운 적부터 경로가 있는 목표를 골라 쫓아가고 사거리 안이면 공격.
+    적이 없거나 닿을 수 없으면 열쇠(잠긴 문이 있을 때) -> 출구 순
+    """
+    repath = 0.25
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.path = []
+        self.timer = 0.0
+        self.target = None
+
+    def _targets(self, world, px, py):
+        foes = [e for e in world.spatial.nearest(px, py, k=4) if e.alive()]
+        if world.boss and world.boss.alive(): foes.append(world.boss)
+        foes.sort(key=lambda e: math.hypot(e.center()[0]-px, e.center()[1]-py))
+        out = [e.rect for e in foes]
+        if world.doors and world.player.keys == 0: out += world.keys
+        if world.goal is not None: out.append(world.goal)
+        return out
+
+    def __call__(self, world, dt):
+        p = world.player
+        px, py = p.center()
+        reach = p.attack_range + game.TILE*0.5
+        attack = any(e.alive() for e in world.spatial.query_radius(px, py, reach))
+        if world.boss and world.boss.alive():
+            bx, by = world.boss.center()
+            attack = attack or math.hypot(bx-px, by-py) <= reach + 8
+        self.timer -= dt
+        if self.timer <= 0:
+            self.timer = self.repath
+            self.target, self.path = None, []
+            for r in self._targets(world, px, py):
+                path = world.find_path(p.rect, r).path
+                if path:
+                    self.target, self.path = r, list(path)
+                    break
+        here = game.tile_of_rect(p.rect)
+        while self.path and self.path[0] == here: self.path.pop(0)
+        if self.path:
+            tx, ty = self.path[0]
+            T = game.TILE
+            dx = (tx*T + T//2) - px; dy = (ty*T + T//2) - py
+        elif self.target is not None:
+            dx, dy = self.target.centerx - px, self.target.centery - py
+        else:
+            dx, dy = self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)
+        move = ((dx > 2) - (dx < -2), (dy > 2) - (dy < -2))
+        return SimInput(move=move, attack=attack)
+
+class RandomPolicy:
+    """0.5초마다 방향을 바꾸며 아무 데나 걷고 가끔 공격"""
+    def __init__(self, rng):
+        self.rng = rng
+        self.move = (0, 0)
+        self.timer = 0.0
+
+    def __call__(self, world, dt):
+        self.timer -= dt
+        if self.timer <= 0:
+            self.timer = 0.5
+            self.move = (self.rng.choice((-1, 0, 1)), self.rng.choice((-1, 0, 1)))
+        return SimInput(move=self.move, attack=self.rng.random() < 0.05)
+
+POLICIES = {"scripted": ScriptedPolicy, "random": RandomPolicy}
+
+# ---- 에피소드 ----
+def run_episode(job):
+    """조합 하나를 끝(클리어/사망/시간 제한)까지 돌리고 지표 dict 반환"""
+    seed, difficulty, map_seed, policy, max_time, levels = job
+    rng = RngRegistry(seed)
+    # 게임을 --seed map_seed로 켠 것과 같은 층 세트 (choose_levels_data와 같은 "mapgen" 스트림)
+    level_set = generate_level_set(n=levels, size=game.MAPGEN_SIZE, rng=RngRegistry(map_seed).stream("mapgen"))
+    options = dict(game.DEFAULT_OPTIONS, difficulty=difficulty)
+    wep_dict = load_weapons(ROOT / "data" / "weapons.json")
+    relic_dict = load_relics(ROOT / "data" / "relics.json")
+    world = game.World(level_set, options=options, drops=game.DEFAULT_DROPS, wep_dict=wep_dict, relic_dict=relic_dict, rng=rng)
+    world.director = Director(world, factories={"enemy": game.Enemy, "ranged": game.RangedEnemy})
+    if "Rusty Sword" in wep_dict:
+        world.player.weapon = Weapon("Rusty Sword", wep_dict["Rusty Sword"])
+        world.player.weapon.on_equip(world.player)
+    brain = POLICIES[policy](rng.stream("policy"))
+
+    dt = game.SIM_DT
+    t = 0.0
+    kills = 0
+    damage = 0
+    cleared = dead = False
+    while t < max_time:
+        hp = world.player.hp
+        for ev in world.step(brain(world, dt), dt):
+            if ev.name == "enemy_died": kills += 1
+            elif ev.name == "player_died": dead = True
+            elif ev.name == "won": cleared = True
+            elif ev.name == "level_advanced": hp = world.player.hp
+        damage += max(0, hp - world.player.hp)
+        t += dt
+        if dead or cleared: break
+    return {
+        "seed": seed, "difficulty": difficulty, "map_seed": map_seed, "policy": policy,
+        "cleared": cleared, "time_to_clear": round(t, 3) if cleared else None, "sim_time": round(t, 3),
+        "deaths": int(dead), "damage_taken": damage, "coins": world.player.coins,
+        "kills": kills, "stage": world.level_index + 1,
+    }
+
+def to_columns(rows):
+    return {"rows": len(rows), "columns": {c: [r[c] for r in rows] for c in COLUMNS}}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="헤드리스 몬테카를로 밸런스 스윕")
+    ap.add_argument("--seeds", type=int, default=16, help="난이도/맵 시드 조합마다 돌릴 시드 수")
+    ap.add_argument("--seed-base", type=int, default=0)
+    ap.add_argument("--difficulties", default="Easy,Normal,Hard")
+    ap.add_argument("--map-seeds", default="1234", help="쉼표 구분 맵 생성 시드")
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="scripted")
+    ap.add_argument("--levels", type=int, default=3)
+    ap.add_argument("--max-time", type=float, default=180.0, help="에피소드당 게임 시간 상한(초)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default="balance.json")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    diffs = [d for d in args.difficulties.split(",") if d]
+    map_seeds = [int(m) for m in args.map_seeds.split(",") if m]
+    jobs = [(args.seed_base + s, d, m, args.policy, args.max_time, args.levels)
+            for d in diffs for m in map_seeds for s in range(args.seeds)]
+    t0 = time.perf_counter()
+    if args.jobs > 1:
+        with Pool(args.jobs) as pool:
+            rows = pool.map(run_episode, jobs, chunksize=max(1, len(jobs) // (args.jobs*4)))
+    else:
+        rows = [run_episode(j) for j in jobs]
+    Path(args.out).write_text(json.dumps(to_columns(rows)), encoding="utf-8")
+    print(f"{len(rows)} episodes in {time.perf_counter()-t0:.1f}s -> {args.out}")
+    for d in diffs:
+        sub = [r for r in rows if r["difficulty"] == d]
+        clr = [r["time_to_clear"] for r in sub if r["cleared"]]
+        print(f"  {d:6s} clear {len(clr)}/{len(sub)}"
+              f"  deaths {sum(r['deaths'] for r in sub)}"
+              f"  mean dmg {sum(r['damage_taken'] for r in sub)/max(1, len(sub)):.1f}"
+              f"  mean kills {sum(r['kills'] for r in sub)/max(1, len(sub)):.1f}"
+              + (f"  mean clear {sum(clr)/len(clr):.1f}s" if clr else ""))
+
+if __name__ == "__main__":
+    main()